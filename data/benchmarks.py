@@ -1,8 +1,39 @@
 """
 Industry Benchmarks for AI Process Readiness Assessment
 """
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+
 from db.models import DEFAULT_BASELINE
 from data.dimensions import DIMENSIONS
+from utils.benchmark_cache import BENCHMARK_CACHE
+from data.segments import (MIN_SEGMENT_ASSESSMENTS, SEGMENT_LABELS,
+                           parse_segment_benchmark_name, segment_benchmark_name)
+from utils.percentiles import TOTAL_SERIES, dimension_series, get_percentile_engine
+
+MOVING_AVERAGE_BENCHMARK = "Moving Average Benchmark"
+
+# Rolling-window benchmarks read from daily aggregates: name -> days
+WINDOW_BENCHMARKS = {
+    "Last 30 Days": 30,
+    "Last 90 Days": 90,
+    "Last 365 Days": 365,
+}
+DECAYED_BENCHMARK = "Recent Trend (Decayed)"
+# Weight of an assessment halves every this many days
+DECAY_HALF_LIFE_DAYS = 30
+# Oldest day read for any window, including the decayed one
+MAX_WINDOW_DAYS = 365
+
+# Benchmarks read from the percentile histograms: name -> quantile
+QUANTILE_BENCHMARKS = {
+    "Top 10% of Assessments": 0.9,
+    "Top Quartile of Assessments": 0.75,
+    "Median Assessment": 0.5,
+}
 
 # Industry benchmark scores (average scores across different maturity levels)
 INDUSTRY_BENCHMARKS = {
@@ -71,53 +102,125 @@ from data.dimensions import DIMENSIONS
 # BENCHMARK COMPARISON
 # ------------------------------------------
 
-def get_benchmark_comparison(your_scores, benchmark_name="Industry Average"):
-
-    if benchmark_name not in INDUSTRY_BENCHMARKS:
-        benchmark_name = "Industry Average"
+# Performance labels and colors, indexed by label code
+PERFORMANCE_LABELS = ("Below Benchmark", "In Line", "Above Benchmark")
+PERFORMANCE_COLORS = (
+    "#DC2626",  # Red
+    "#F59E0B",  # Amber
+    "#10B981",  # Green
+)
+LABEL_BELOW = 0
+LABEL_IN_LINE = 1
+LABEL_ABOVE = 2
+
+# Difference, in tenths of a point, that counts as above or below
+PERFORMANCE_MARGIN_TENTHS = 10
+
+
+def _tenths(values):
+    """Scores as integer tenths, i.e. rounded to one decimal without float drift"""
+    return np.rint(np.asarray(values, dtype=np.float64) * 10).astype(np.int64)
+
+
+def get_benchmark_comparison_matrix(your_scores, benchmark_names=None, snapshot=None):
+    """
+    Compare one assessment against many benchmarks at once.
+
+    Args:
+        your_scores: compute_scores result
+        benchmark_names: Benchmarks to compare against (all of
+                         get_all_benchmarks() by default); unknown names
+                         fall back to Industry Average
+        snapshot: Benchmark snapshot to compare against (see
+                  get_benchmark_snapshot); live benchmarks when None
+
+    Returns:
+        Dict with benchmark names and descriptions, dimension ids and
+        titles, and NumPy arrays (benchmarks x dimensions) of benchmark
+        scores, differences and label codes into PERFORMANCE_LABELS /
+        PERFORMANCE_COLORS, plus the totals and the snapshot id. Scores
+        are rounded to one decimal like get_benchmark_comparison.
+    """
+    if snapshot is not None:
+        profiles = snapshot["benchmarks"]
+        if benchmark_names is None:
+            benchmark_names = list(profiles)
+        names = [name if name in profiles else "Industry Average" for name in benchmark_names]
+        benchmarks = [
+            profiles.get(name) or INDUSTRY_BENCHMARKS["Industry Average"] for name in names
+        ]
+    else:
+        if benchmark_names is None:
+            benchmark_names = get_all_benchmarks()
+        names = [name if is_known_benchmark(name) else "Industry Average" for name in benchmark_names]
+        benchmarks = [get_benchmark_data(name) for name in names]
 
-    benchmark = INDUSTRY_BENCHMARKS[benchmark_name]
     dimension_scores = your_scores["dimension_scores"]
-
-    comparison = {
-        "benchmark_name": benchmark_name,
-        "benchmark_description": benchmark["description"],
-        "your_total": round(your_scores["total"], 1),
-        "benchmark_total": round(benchmark["total"], 1),
-        "total_difference": round(your_scores["total"] - benchmark["total"], 1),
-        "dimensions": []
+    dimension_ids = [score_data["id"] for score_data in dimension_scores]
+
+    your_tenths = _tenths([score_data["score"] for score_data in dimension_scores])
+    benchmark_tenths = _tenths(
+        [[benchmark.get(dim_id, 0) for dim_id in dimension_ids] for benchmark in benchmarks]
+    ).reshape(len(benchmarks), len(dimension_ids))
+    difference_tenths = your_tenths[None, :] - benchmark_tenths
+
+    your_total_tenths = int(_tenths(your_scores["total"]))
+    benchmark_total_tenths = _tenths([benchmark["total"] for benchmark in benchmarks])
+
+    return {
+        "benchmark_names": names,
+        "benchmark_descriptions": [benchmark["description"] for benchmark in benchmarks],
+        "dimension_ids": dimension_ids,
+        "dimension_titles": [score_data["title"] for score_data in dimension_scores],
+        "your_scores": your_tenths / 10,
+        "benchmark_scores": benchmark_tenths / 10,
+        "differences": difference_tenths / 10,
+        "label_codes": (
+            LABEL_IN_LINE
+            + (difference_tenths >= PERFORMANCE_MARGIN_TENTHS)
+            - (difference_tenths <= -PERFORMANCE_MARGIN_TENTHS)
+        ).astype(np.int8),
+        "your_total": your_total_tenths / 10,
+        "benchmark_totals": benchmark_total_tenths / 10,
+        "total_differences": (your_total_tenths - benchmark_total_tenths) / 10,
+        "snapshot_id": snapshot["id"] if snapshot is not None else None,
     }
 
-    for score_data in dimension_scores:
 
-        dim_id = score_data["id"]
-        your_score = round(score_data["score"], 1)
-        benchmark_score = round(benchmark.get(dim_id, 0), 1)
-
-        difference = round(your_score - benchmark_score, 1)
-
-        # Color-coded performance label
-        if difference >= 1:
-            label = "Above Benchmark"
-            color = "#10B981"  # Green
-        elif difference <= -1:
-            label = "Below Benchmark"
-            color = "#DC2626"  # Red
-        else:
-            label = "In Line"
-            color = "#F59E0B"  # Amber
+def comparison_from_matrix(matrix, row):
+    """The get_benchmark_comparison result for one row of a comparison matrix"""
+    your_scores = matrix["your_scores"].tolist()
+    benchmark_scores = matrix["benchmark_scores"][row].tolist()
+    differences = matrix["differences"][row].tolist()
+    label_codes = matrix["label_codes"][row].tolist()
+
+    return {
+        "benchmark_name": matrix["benchmark_names"][row],
+        "benchmark_description": matrix["benchmark_descriptions"][row],
+        "your_total": matrix["your_total"],
+        "benchmark_total": float(matrix["benchmark_totals"][row]),
+        "total_difference": float(matrix["total_differences"][row]),
+        "dimensions": [
+            {
+                "id": dim_id,
+                "title": title,
+                "your_score": your_score,
+                "benchmark_score": benchmark_score,
+                "difference": difference,
+                "performance_label": PERFORMANCE_LABELS[code],
+                "color": PERFORMANCE_COLORS[code]
+            }
+            for dim_id, title, your_score, benchmark_score, difference, code in zip(
+                matrix["dimension_ids"], matrix["dimension_titles"],
+                your_scores, benchmark_scores, differences, label_codes
+            )
+        ]
+    }
 
-        comparison["dimensions"].append({
-            "id": dim_id,
-            "title": score_data["title"],
-            "your_score": your_score,
-            "benchmark_score": benchmark_score,
-            "difference": difference,
-            "performance_label": label,
-            "color": color
-        })
 
-    return comparison
+def get_benchmark_comparison(your_scores, benchmark_name="Industry Average", snapshot=None):
+    matrix = get_benchmark_comparison_matrix(your_scores, [benchmark_name], snapshot)
+    return comparison_from_matrix(matrix, 0)
 
 
 # ------------------------------------------
@@ -125,20 +228,134 @@ def get_benchmark_comparison(your_scores, benchmark_name="Industry Average"):
 # ------------------------------------------
 
 def get_all_benchmarks():
-    return ["Moving Average Benchmark"] + list(INDUSTRY_BENCHMARKS.keys())
+    benchmarks = [MOVING_AVERAGE_BENCHMARK] + list(INDUSTRY_BENCHMARKS.keys())
+
+    # Percentile benchmarks once there are completed assessments to rank
+    engine = get_percentile_engine()
+    if engine is not None and engine.assessment_count:
+        benchmarks += list(QUANTILE_BENCHMARKS.keys())
+
+    benchmarks += list(get_window_benchmarks().keys())
+
+    benchmarks += [
+        segment_benchmark_name(segment, value)
+        for segment, value, _ in get_segment_list()
+    ]
+
+    return benchmarks
+
+
+def is_known_benchmark(benchmark_name):
+    return (
+        benchmark_name == MOVING_AVERAGE_BENCHMARK
+        or benchmark_name in INDUSTRY_BENCHMARKS
+        or benchmark_name in QUANTILE_BENCHMARKS
+        or benchmark_name in WINDOW_BENCHMARKS
+        or benchmark_name == DECAYED_BENCHMARK
+        or parse_segment_benchmark_name(benchmark_name) is not None
+    )
 
 
 def get_benchmark_data(benchmark_name):
 
-    if benchmark_name == "Moving Average Benchmark":
+    if benchmark_name == MOVING_AVERAGE_BENCHMARK:
         return get_moving_average_benchmark()
 
+    if benchmark_name in QUANTILE_BENCHMARKS:
+        benchmark = get_quantile_benchmark(QUANTILE_BENCHMARKS[benchmark_name])
+        if benchmark is not None:
+            return benchmark
+
+    if benchmark_name in WINDOW_BENCHMARKS or benchmark_name == DECAYED_BENCHMARK:
+        benchmark = get_window_benchmarks().get(benchmark_name)
+        if benchmark is not None:
+            return benchmark
+
+    segment = parse_segment_benchmark_name(benchmark_name)
+    if segment is not None:
+        benchmark = get_segment_benchmark(*segment)
+        if benchmark is not None:
+            return benchmark
+
     return INDUSTRY_BENCHMARKS.get(
         benchmark_name,
         INDUSTRY_BENCHMARKS["Industry Average"]
     )
 
 
+# ------------------------------------------
+# BENCHMARK SNAPSHOTS
+# ------------------------------------------
+
+# A new snapshot is published when the latest one is older than this
+DEFAULT_SNAPSHOT_MAX_AGE = 3600
+SNAPSHOT_MAX_AGE = float(os.environ.get("BENCHMARK_SNAPSHOT_MAX_AGE", DEFAULT_SNAPSHOT_MAX_AGE))
+
+
+def build_benchmark_snapshot():
+    """Every benchmark's current profile, by name"""
+    return {name: get_benchmark_data(name) for name in get_all_benchmarks()}
+
+
+def _publish_benchmark_snapshot():
+    from db.operations import save_benchmark_snapshot
+
+    return save_benchmark_snapshot(build_benchmark_snapshot())
+
+
+def publish_benchmark_snapshot():
+    """
+    Freeze the current benchmarks into a new immutable snapshot.
+
+    Returns:
+        Snapshot dict with id (the version), created_at and benchmarks
+    """
+    snapshot = _publish_benchmark_snapshot()
+    BENCHMARK_CACHE.invalidate()
+    return snapshot
+
+
+@lru_cache(maxsize=32)
+def _load_benchmark_snapshot(snapshot_id):
+    # Snapshots never change, so lookups by id are cached for the process
+    from db.operations import get_benchmark_snapshot_by_id
+
+    snapshot = get_benchmark_snapshot_by_id(snapshot_id)
+    if snapshot is None:
+        raise KeyError(f"Unknown benchmark snapshot: {snapshot_id}")
+    return snapshot
+
+
+def _latest_benchmark_snapshot():
+    from db.operations import get_benchmark_snapshot_by_id
+
+    snapshot = get_benchmark_snapshot_by_id()
+    if snapshot is None or (
+        datetime.utcnow() - snapshot["created_at"]
+    ).total_seconds() >= SNAPSHOT_MAX_AGE:
+        snapshot = _publish_benchmark_snapshot()
+    return snapshot
+
+
+def get_benchmark_snapshot(snapshot_id=None):
+    """
+    Benchmark snapshot by id, or the latest one when snapshot_id is None.
+    The latest snapshot is republished once it is older than
+    SNAPSHOT_MAX_AGE seconds, so new results compare against recent
+    benchmarks while stored results keep the snapshot they were shown.
+
+    Returns:
+        Snapshot dict, or None if it cannot be loaded
+    """
+    try:
+        if snapshot_id is not None:
+            return _load_benchmark_snapshot(int(snapshot_id))
+        return BENCHMARK_CACHE.get_or_load("snapshot", _latest_benchmark_snapshot)
+    except Exception as e:
+        print(f"Benchmark snapshot fetch error: {e}")
+        return None
+
+
 # ------------------------------------------
 # MOVING AVERAGE BENCHMARK
 # ------------------------------------------
@@ -148,7 +365,10 @@ def get_moving_average_benchmark():
     try:
         from db.operations import get_current_benchmark
 
-        benchmark_scores = get_current_benchmark()
+        # Served from the process-wide cache; update_benchmark invalidates it
+        benchmark_scores = BENCHMARK_CACHE.get_or_load(
+            MOVING_AVERAGE_BENCHMARK, lambda: tuple(get_current_benchmark())
+        )
 
         benchmark_dict = {}
         total = 0
@@ -179,3 +399,207 @@ def get_moving_average_benchmark():
         fallback["description"] = "Baseline benchmark (dynamic benchmark unavailable)."
 
         return fallback
+
+
+# ------------------------------------------
+# PERCENTILE BENCHMARKS
+# ------------------------------------------
+
+def get_benchmark_quantiles(quantiles=(0.25, 0.5, 0.75, 0.9), variant_id=None):
+    """
+    Score at each quantile for the total and every dimension, read from
+    the persisted answer histograms without scanning assessments.
+
+    Returns:
+        {"total": {q: score}, <dimension id>: {q: score}, ...}, or None
+        when no assessments have been recorded yet
+    """
+    engine = get_percentile_engine(variant_id=variant_id)
+    if engine is None or not engine.assessment_count:
+        return None
+
+    result = {"total": engine.quantiles(quantiles, TOTAL_SERIES)}
+    for dim_id in engine.plan.dimension_ids:
+        result[dim_id] = engine.quantiles(quantiles, dimension_series(dim_id))
+    return result
+
+
+def get_benchmark_percentile(score, dimension_id=None, variant_id=None):
+    """Percentile rank (0-100) of a total or dimension score, or None without data"""
+    engine = get_percentile_engine(variant_id=variant_id)
+    if engine is None:
+        return None
+    series = TOTAL_SERIES if dimension_id is None else dimension_series(dimension_id)
+    return engine.percentile(score, series)
+
+
+def get_quantile_benchmark(quantile, variant_id=None):
+    """
+    Benchmark profile at one quantile of completed assessments (0.9 is the
+    top-10% threshold), shaped like an INDUSTRY_BENCHMARKS entry.
+    """
+    quantiles = get_benchmark_quantiles((quantile,), variant_id)
+    if quantiles is None:
+        return None
+
+    benchmark = {
+        dim["id"]: quantiles[dim["id"]][quantile]
+        for dim in DIMENSIONS
+        if dim["id"] in quantiles
+    }
+    benchmark["total"] = quantiles["total"][quantile]
+    benchmark["description"] = (
+        f"Scores reached by the top {round((1 - quantile) * 100)}% of completed assessments "
+        "in each dimension and overall."
+        if quantile < 1 else "Highest scores among completed assessments."
+    )
+    return benchmark
+
+
+# ------------------------------------------
+# TIME-WINDOWED BENCHMARKS
+# ------------------------------------------
+
+def _aggregate_benchmark(metrics, counts, sums, sum_squares, description):
+    """Benchmark dict from per-metric (weighted) count, sum and sum of squares"""
+    benchmark = {}
+    std_dev = {}
+    for metric, count, metric_sum, squares in zip(metrics, counts, sums, sum_squares):
+        if count <= 0:
+            continue
+        mean = metric_sum / count
+        benchmark[metric] = round(float(mean), 1)
+        # Clamp tiny negative variance from floating point cancellation
+        std_dev[metric] = round(float(max(squares / count - mean * mean, 0.0)) ** 0.5, 2)
+
+    benchmark["std_dev"] = std_dev
+    benchmark["description"] = description
+    return benchmark
+
+
+def compute_window_benchmarks(rows, today):
+    """
+    Rolling-window and exponentially decayed benchmarks from daily
+    aggregate rows, all windows in one vectorized pass.
+
+    Args:
+        rows: (day, metric, count, sum, sum of squares) rows
+        today: Date the windows end on
+
+    Returns:
+        Benchmark name -> benchmark dict, for windows with assessments
+    """
+    if not rows:
+        return {}
+
+    days, metric_names, counts, sums, sum_squares = zip(*rows)
+    metrics = sorted(set(metric_names))
+    metric_index = np.array([metrics.index(metric) for metric in metric_names])
+    ages = np.array([(today - day).days for day in days])
+    values = np.array([counts, sums, sum_squares], dtype=np.float64)
+
+    def totals(weights):
+        """Per-metric weighted (count, sum, sum of squares)"""
+        return np.stack([
+            np.bincount(metric_index, weights=row * weights, minlength=len(metrics))
+            for row in values
+        ])
+
+    benchmarks = {}
+    total_position = metrics.index("total") if "total" in metrics else None
+    for name, window_days in WINDOW_BENCHMARKS.items():
+        window = totals(((ages >= 0) & (ages < window_days)).astype(np.float64))
+        assessment_count = int(window[0][total_position]) if total_position is not None else 0
+        if not assessment_count:
+            continue
+        benchmark = _aggregate_benchmark(
+            metrics, *window,
+            description=(
+                f"Average of the {assessment_count} completed assessments "
+                f"in the last {window_days} days."
+            )
+        )
+        benchmark["assessment_count"] = assessment_count
+        benchmarks[name] = benchmark
+
+    decay = np.where(
+        (ages >= 0) & (ages < MAX_WINDOW_DAYS), 0.5 ** (ages / DECAY_HALF_LIFE_DAYS), 0.0
+    )
+    decayed = totals(decay)
+    if total_position is not None and decayed[0][total_position] > 0:
+        benchmarks[DECAYED_BENCHMARK] = _aggregate_benchmark(
+            metrics, *decayed,
+            description=(
+                "Average of completed assessments weighted toward recent results "
+                f"(weights halve every {DECAY_HALF_LIFE_DAYS} days)."
+            )
+        )
+
+    return benchmarks
+
+
+def get_window_benchmarks():
+    """Time-windowed benchmarks ending today (UTC), cached with the other benchmarks"""
+    today = datetime.utcnow().date()
+    try:
+        from db.operations import get_daily_aggregate_rows
+
+        return BENCHMARK_CACHE.get_or_load(
+            ("windows", today),
+            lambda: compute_window_benchmarks(
+                get_daily_aggregate_rows(today - timedelta(days=MAX_WINDOW_DAYS - 1)), today
+            )
+        )
+    except Exception as e:
+        print(f"Window benchmark fetch error: {e}")
+        return {}
+
+
+# ------------------------------------------
+# SEGMENT BENCHMARKS
+# ------------------------------------------
+
+def get_segment_list():
+    """(segment, value, count) for every segment large enough to benchmark against"""
+    try:
+        from db.operations import list_segments
+
+        return BENCHMARK_CACHE.get_or_load(
+            "segments", lambda: tuple(list_segments(MIN_SEGMENT_ASSESSMENTS))
+        )
+    except Exception as e:
+        print(f"Segment list fetch error: {e}")
+        return ()
+
+
+def get_segment_benchmark(segment, value):
+    """
+    Mean and standard deviation per dimension and total for one segment,
+    from its stored (count, sum, sum of squares) rows. None when the
+    segment has no assessments.
+    """
+    try:
+        from db.operations import get_segment_aggregates
+
+        aggregates = BENCHMARK_CACHE.get_or_load(
+            ("segment", segment, value), lambda: get_segment_aggregates(segment, value)
+        )
+    except Exception as e:
+        print(f"Segment benchmark fetch error: {e}")
+        return None
+
+    total = aggregates.get("total")
+    if not total or not total[0]:
+        return None
+
+    metrics = list(aggregates)
+    counts, sums, sum_squares = zip(*aggregates.values())
+    benchmark = _aggregate_benchmark(
+        metrics, counts, sums, sum_squares,
+        description=(
+            f"Average of {total[0]} completed assessments where "
+            f"{SEGMENT_LABELS[segment]} is {value}."
+        )
+    )
+    benchmark["assessment_count"] = total[0]
+    return benchmark
@@ -0,0 +1,152 @@
+"""
+Questionnaire loader for Governance-First AI Readiness Framework
+
+The questionnaire is declared in data/questionnaire.json and compiled into
+frozen, slotted objects with read-only id-indexed lookups and the
+radio-widget options precomputed. Compiling takes well under a
+millisecond, so it happens once per process and nothing is cached on disk.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+QUESTIONNAIRE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'questionnaire.json')
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Question:
+    id: str
+    text: str
+    # ((value, label), ...) in scale order
+    answer_choices: Tuple[Tuple[int, str], ...]
+    # Radio widget options and their "<value> - <label>" captions
+    radio_options: Tuple[int, ...]
+    radio_labels: Mapping[int, str]
+    dimension_index: int
+    position: int
+
+    def choice_label(self, value) -> str:
+        return dict(self.answer_choices).get(value, str(value))
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Dimension:
+    id: str
+    title: str
+    weight: float
+    critical: bool
+    description: str
+    color: str
+    questions: Tuple[Question, ...]
+    index: int
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Questionnaire:
+    version: int
+    dimensions: Tuple[Dimension, ...]
+    question_ids: Tuple[str, ...]
+    # question id -> (dimension index, position within the dimension)
+    question_index: Mapping[str, Tuple[int, int]]
+    dimension_index: Mapping[str, int]
+    title: str = ''
+    # Scoring rule overrides declared by a questionnaire variant
+    scoring_rules: Optional[Mapping] = None
+
+    def question(self, question_id: str) -> Optional[Question]:
+        location = self.question_index.get(question_id)
+        if location is None:
+            return None
+        dim_idx, position = location
+        return self.dimensions[dim_idx].questions[position]
+
+    def dimension(self, dimension_id: str) -> Optional[Dimension]:
+        index = self.dimension_index.get(dimension_id)
+        return None if index is None else self.dimensions[index]
+
+    def as_dicts(self) -> list:
+        """The questionnaire as the list-of-dicts DIMENSIONS structure"""
+        return [
+            {
+                'id': dimension.id,
+                'title': dimension.title,
+                'weight': dimension.weight,
+                'critical': dimension.critical,
+                'description': dimension.description,
+                'color': dimension.color,
+                'questions': [
+                    {
+                        'id': question.id,
+                        'text': question.text,
+                        'answer_choices': dict(question.answer_choices),
+                    }
+                    for question in dimension.questions
+                ],
+            }
+            for dimension in self.dimensions
+        ]
+
+
+# ------------------------------------------
+# COMPILATION
+# ------------------------------------------
+
+def compile_questionnaire(definition: Dict) -> Questionnaire:
+    """Compile a parsed questionnaire definition into frozen objects"""
+    dimensions = []
+    question_index = {}
+    question_ids = []
+
+    for dim_idx, dim_def in enumerate(definition['dimensions']):
+        questions = []
+        for position, q_def in enumerate(dim_def['questions']):
+            choices = tuple(sorted(
+                (int(value), label) for value, label in q_def['answer_choices'].items()
+            ))
+            if q_def['id'] in question_index:
+                raise ValueError(f"Duplicate question id: {q_def['id']}")
+            question_index[q_def['id']] = (dim_idx, position)
+            question_ids.append(q_def['id'])
+            questions.append(Question(
+                id=q_def['id'],
+                text=q_def['text'],
+                answer_choices=choices,
+                radio_options=tuple(value for value, _ in choices),
+                radio_labels=MappingProxyType({value: f"{value} - {label}" for value, label in choices}),
+                dimension_index=dim_idx,
+                position=position,
+            ))
+
+        dimensions.append(Dimension(
+            id=dim_def['id'],
+            title=dim_def['title'],
+            weight=dim_def.get('weight', 1.0),
+            critical=dim_def.get('critical', False),
+            description=dim_def.get('description', ''),
+            color=dim_def.get('color', '#FFFFFF'),
+            questions=tuple(questions),
+            index=dim_idx,
+        ))
+
+    scoring_rules = definition.get('scoring_rules')
+    return Questionnaire(
+        version=definition.get('version', 1),
+        dimensions=tuple(dimensions),
+        question_ids=tuple(question_ids),
+        question_index=MappingProxyType(question_index),
+        dimension_index=MappingProxyType({dimension.id: dimension.index for dimension in dimensions}),
+        title=definition.get('title', ''),
+        scoring_rules=MappingProxyType(scoring_rules) if scoring_rules is not None else None,
+    )
+
+
+def load_questionnaire(path: str = QUESTIONNAIRE_PATH) -> Questionnaire:
+    """Load and compile a questionnaire file"""
+    with open(path, encoding='utf-8') as f:
+        return compile_questionnaire(json.load(f))
+
+
+QUESTIONNAIRE = load_questionnaire()
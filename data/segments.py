@@ -0,0 +1,79 @@
+"""
+Benchmark segments for AI Process Readiness Assessment
+
+Completed assessments are also aggregated per segment: AI implementation
+stage, company size bracket and region. This module defines the segment
+types, their options and how raw session inputs map to segment values.
+"""
+from typing import Dict, Optional, Tuple
+
+SEGMENT_STAGE = 'stage'
+SEGMENT_SIZE = 'size'
+SEGMENT_REGION = 'region'
+
+# Segment type -> label used in benchmark names
+SEGMENT_LABELS = {
+    SEGMENT_STAGE: 'AI Stage',
+    SEGMENT_SIZE: 'Company Size',
+    SEGMENT_REGION: 'Region',
+}
+
+AI_STAGE_OPTIONS = [
+    "Exploring / learning about AI",
+    "Planning first pilot project",
+    "Running 1-2 pilot projects",
+    "Scaling successful pilots",
+    "AI embedded in operations"
+]
+
+COMPANY_SIZE_OPTIONS = [
+    "< 50 employees",
+    "50–500 employees",
+    "500+ employees"
+]
+
+# Segments need this many assessments before they are offered as benchmarks
+MIN_SEGMENT_ASSESSMENTS = 5
+
+
+def region_from_location(location: Optional[str]) -> Optional[str]:
+    """
+    Region for a free-text location: its last comma-separated part,
+    e.g. "New York, NY" -> "NY", "London, UK" -> "UK".
+    """
+    if not location:
+        return None
+    region = location.split(',')[-1].strip()
+    if not region:
+        return None
+    return region.upper() if len(region) <= 3 else region.title()
+
+
+def assessment_segments(
+    ai_stage: Optional[str] = None,
+    company_size: Optional[str] = None,
+    location: Optional[str] = None
+) -> Dict[str, str]:
+    """Segment values for one assessment; unknown or empty inputs are left out"""
+    segments = {}
+    if ai_stage in AI_STAGE_OPTIONS:
+        segments[SEGMENT_STAGE] = ai_stage
+    if company_size in COMPANY_SIZE_OPTIONS:
+        segments[SEGMENT_SIZE] = company_size
+    region = region_from_location(location)
+    if region:
+        segments[SEGMENT_REGION] = region[:100]
+    return segments
+
+
+def segment_benchmark_name(segment: str, value: str) -> str:
+    return f"{SEGMENT_LABELS[segment]}: {value}"
+
+
+def parse_segment_benchmark_name(benchmark_name: str) -> Optional[Tuple[str, str]]:
+    """(segment, value) for a segment benchmark name, or None"""
+    for segment, label in SEGMENT_LABELS.items():
+        prefix = f"{label}: "
+        if benchmark_name.startswith(prefix):
+            return segment, benchmark_name[len(prefix):]
+    return None
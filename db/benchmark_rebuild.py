@@ -0,0 +1,171 @@
+"""
+Exact rebuild and drift check for the moving-average benchmark.
+
+update_benchmark adds each assessment to the benchmark accumulators, so
+deleted assessments are never subtracted, and benchmarks stored before the
+accumulators were rounded means. The functions here recompute the exact
+benchmark with one server-side aggregate over the typed dimension score
+columns of assessments, so no rows or ORM objects are loaded into Python.
+"""
+from typing import Dict, Optional
+
+from sqlalchemy import and_, case, func, not_, select
+
+from data.dimensions import DIMENSIONS
+from db.models import (DIMENSION_SCORE_COLUMNS, Assessment, Benchmark, BenchmarkAccumulator,
+                       DEFAULT_BASELINE, get_db_session)
+from db.operations import _create_counter_rows, get_benchmark_totals
+from utils.benchmark_cache import invalidate_benchmark_cache
+
+# Largest per-dimension difference the drift check tolerates
+DEFAULT_DRIFT_TOLERANCE = 0.05
+
+
+def dimension_score_columns() -> list:
+    """The typed dimension score columns, in DIMENSIONS order"""
+    return [getattr(Assessment, DIMENSION_SCORE_COLUMNS[dimension['id']]) for dimension in DIMENSIONS]
+
+
+def _all_equal(scores, value):
+    return and_(*[score == value for score in scores])
+
+
+def exact_benchmark_query():
+    """
+    One aggregate row: the number of non-outlier assessments and the sum
+    of each dimension over them (outliers as in is_outlier_assessment).
+    """
+    scores = dimension_score_columns()
+    outlier = _all_equal(scores, 1) | _all_equal(scores, 5)
+    return select(func.count(), *[func.sum(score) for score in scores]).where(not_(outlier))
+
+
+def compute_exact_benchmark(session) -> Dict:
+    """
+    Returns:
+        Dict with the assessment count, the dimension sums and the exact
+        dimension means (None when there are no assessments to average)
+    """
+    row = session.execute(exact_benchmark_query()).one()
+    count = row[0] or 0
+    sums = [float(total or 0.0) for total in row[1:]]
+    return {
+        'assessment_count': count,
+        'dimension_sums': sums,
+        'dimension_scores': [total / count for total in sums] if count else None,
+    }
+
+
+def check_benchmark_drift(tolerance: float = DEFAULT_DRIFT_TOLERANCE) -> Dict:
+    """
+    Compare the stored benchmark with the exact one.
+
+    Returns:
+        Dict with stored and exact scores and counts, the per-dimension
+        drift, the maximum drift and whether it is within tolerance
+    """
+    session = get_db_session()
+    try:
+        exact = compute_exact_benchmark(session)
+        stored_count, stored_sums = get_benchmark_totals(session)
+        if stored_count:
+            stored_scores = [total / stored_count for total in stored_sums]
+        else:
+            # Benchmark stored before the accumulators existed
+            stored = session.query(Benchmark).order_by(Benchmark.updated_at.desc()).first()
+            stored_scores = list(stored.dimension_scores) if stored else DEFAULT_BASELINE.copy()
+            stored_count = stored.assessment_count if stored else 0
+
+        exact_scores = exact['dimension_scores'] or DEFAULT_BASELINE.copy()
+        drift = [
+            abs(stored_score - exact_score)
+            for stored_score, exact_score in zip(stored_scores, exact_scores)
+        ]
+        max_drift = max(drift) if drift else 0.0
+        return {
+            'stored_scores': stored_scores,
+            'stored_count': stored_count,
+            'exact_scores': exact_scores,
+            'exact_count': exact['assessment_count'],
+            'drift': drift,
+            'max_drift': max_drift,
+            'within_tolerance': max_drift <= tolerance and stored_count == exact['assessment_count'],
+        }
+    finally:
+        session.close()
+
+
+def rebuild_benchmark() -> Optional[Dict]:
+    """
+    Replace the benchmark accumulators with the exact sums, collapsed into
+    shard 0. Migration 6 seeds them from the legacy benchmark row, whose
+    rounded means this makes exact.
+
+    The accumulator rows are locked (SELECT ... FOR UPDATE, and on SQLite
+    the database write lock taken by zeroing them) before the exact sums
+    are computed, and the sums are written in the same transaction, so
+    concurrent contributions and rebuilds wait and then apply on top of
+    the rebuilt values. Shards are zeroed rather than deleted, so no
+    writer can recreate a row the rebuild is about to insert.
+
+    This process's write-behind buffer is flushed first. Contributions
+    still buffered in other processes were already counted by the exact
+    sums and are added again when they flush, so rebuild while the app is
+    idle or re-run with --check afterwards.
+
+    Returns:
+        The compute_exact_benchmark result, or None when there are no
+        assessments
+    """
+    from db.benchmark_writer import get_benchmark_writer, write_behind_enabled
+
+    if write_behind_enabled():
+        get_benchmark_writer().flush()
+
+    session = get_db_session()
+    try:
+        session.query(BenchmarkAccumulator.id).with_for_update().all()
+        session.query(BenchmarkAccumulator).update(
+            {BenchmarkAccumulator.count: 0, BenchmarkAccumulator.sum: 0.0},
+            synchronize_session=False
+        )
+
+        exact = compute_exact_benchmark(session)
+        if not exact['assessment_count']:
+            session.rollback()
+            return None
+
+        sums = {
+            dimension['id']: dimension_sum
+            for dimension, dimension_sum in zip(DIMENSIONS, exact['dimension_sums'])
+        }
+
+        def set_shard_zero(metrics):
+            return session.query(BenchmarkAccumulator)\
+                .filter(BenchmarkAccumulator.shard == 0, BenchmarkAccumulator.metric.in_(list(metrics)))\
+                .update({
+                    BenchmarkAccumulator.count: exact['assessment_count'],
+                    BenchmarkAccumulator.sum: case(sums, value=BenchmarkAccumulator.metric),
+                }, synchronize_session=False)
+
+        if set_shard_zero(sums) < len(sums):
+            existing = set(
+                metric for (metric,) in session.query(BenchmarkAccumulator.metric)
+                .filter(BenchmarkAccumulator.shard == 0)
+                .all()
+            )
+            missing = [metric for metric in sums if metric not in existing]
+            _create_counter_rows(session, [
+                BenchmarkAccumulator(shard=0, metric=metric, count=0, sum=0.0)
+                for metric in missing
+            ])
+            set_shard_zero(missing)
+
+        session.commit()
+        invalidate_benchmark_cache()
+        return exact
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
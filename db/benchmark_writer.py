@@ -0,0 +1,166 @@
+"""
+Write-behind batching of moving-average benchmark contributions.
+
+Completed assessments add their dimension scores to an in-process buffer
+instead of writing the benchmark synchronously. The buffer is flushed to
+the benchmark accumulators in one transaction every flush_interval
+seconds, as soon as flush_size assessments are pending, and at interpreter
+exit. A failed flush keeps the contributions buffered for the next one.
+
+Set BENCHMARK_WRITE_BEHIND=0 to write every contribution immediately.
+"""
+import atexit
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from data.dimensions import DIMENSIONS
+from db.models import get_db_session
+from db.operations import record_benchmark_contribution, update_benchmark
+from utils.benchmark_cache import invalidate_benchmark_cache
+
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_FLUSH_SIZE = 50
+
+
+class BenchmarkWriteBehind:
+    """Thread-safe buffer of benchmark contributions with a background flusher"""
+
+    def __init__(self, flush_interval: float = DEFAULT_FLUSH_INTERVAL, flush_size: int = DEFAULT_FLUSH_SIZE):
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._lock = threading.Lock()
+        # Serializes flushes so buffered sums are never written twice
+        self._flush_lock = threading.Lock()
+        self._count = 0
+        self._sums = [0.0] * len(DIMENSIONS)
+        self._oldest = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.flushes = 0
+        self.flushed = 0
+        self.failures = 0
+
+    def add(self, dimension_scores: List[float]) -> None:
+        """Buffer one assessment's dimension scores"""
+        with self._lock:
+            for position, score in enumerate(dimension_scores[:len(self._sums)]):
+                self._sums[position] += float(score)
+            self._count += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = self._count >= self.flush_size
+            if self._thread is None:
+                self._start()
+
+        if full:
+            # Flush on the background thread, off the request path
+            self._wake.set()
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='benchmark-write-behind', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval / 2)
+            self._wake.clear()
+            with self._lock:
+                due = self._count >= self.flush_size or (
+                    self._oldest is not None and time.monotonic() - self._oldest >= self.flush_interval
+                )
+            if due and not self._stop.is_set():
+                self.flush()
+
+    def _take(self):
+        with self._lock:
+            count, sums = self._count, self._sums
+            self._count = 0
+            self._sums = [0.0] * len(DIMENSIONS)
+            self._oldest = None
+            return count, sums
+
+    def _restore(self, count: int, sums: List[float]) -> None:
+        with self._lock:
+            self._count += count
+            self._sums = [current + failed for current, failed in zip(self._sums, sums)]
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def flush(self) -> int:
+        """
+        Write all buffered contributions in one transaction.
+
+        Returns:
+            Number of assessments written
+        """
+        with self._flush_lock:
+            count, sums = self._take()
+            if not count:
+                return 0
+
+            session = get_db_session()
+            try:
+                record_benchmark_contribution(session, sums, count)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self._restore(count, sums)
+                self.failures += 1
+                print(f"Benchmark flush error: {e}")
+                return 0
+            finally:
+                session.close()
+
+            invalidate_benchmark_cache()
+            self.flushes += 1
+            self.flushed += count
+            return count
+
+    def close(self) -> None:
+        """Stop the background flusher and write what is left"""
+        self._stop.set()
+        self._wake.set()
+        self.flush()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'pending': self._count,
+                'flush_interval': self.flush_interval,
+                'flush_size': self.flush_size,
+                'flushes': self.flushes,
+                'flushed': self.flushed,
+                'failures': self.failures,
+            }
+
+
+_writer: Optional[BenchmarkWriteBehind] = None
+_writer_lock = threading.Lock()
+
+
+def write_behind_enabled() -> bool:
+    return os.environ.get('BENCHMARK_WRITE_BEHIND', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def get_benchmark_writer() -> BenchmarkWriteBehind:
+    """The process-wide writer, created (and registered for exit) on first use"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BenchmarkWriteBehind(
+                float(os.environ.get('BENCHMARK_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)),
+                int(os.environ.get('BENCHMARK_FLUSH_SIZE', DEFAULT_FLUSH_SIZE)),
+            )
+            atexit.register(_writer.close)
+        return _writer
+
+
+def submit_benchmark_contribution(dimension_scores: List[float]) -> None:
+    """Add one assessment to the benchmark, buffered unless write-behind is off"""
+    if write_behind_enabled():
+        get_benchmark_writer().add(dimension_scores)
+    else:
+        update_benchmark(dimension_scores)
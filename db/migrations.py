@@ -0,0 +1,232 @@
+"""
+Versioned schema migrations.
+
+init_db creates missing tables with create_all, which never changes tables
+that already exist. Changes to existing tables are migrations: numbered
+functions applied in order, each in its own transaction, and recorded in
+schema_migrations. Every migration inspects the live schema first, so on a
+database that create_all has just built from the current models it only
+records its version.
+
+Add a migration by appending a function decorated with @migration(<next
+version>, "<description>"); never renumber or edit one that has shipped.
+Every model column added to an existing table needs one: after migrating,
+migrate() fails with the list of model columns the database still lacks,
+rather than letting the first INSERT fail at request time.
+"""
+from typing import Callable, List, Tuple
+
+from sqlalchemy import func, inspect, select, text, update
+
+from data.dimensions import DIMENSIONS
+from db.models import (DIMENSION_SCORE_COLUMNS, AnswerHistogram, Assessment, Base, Benchmark,
+                       BenchmarkAccumulator, DailyAggregate, SchemaMigration, User)
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = []
+
+
+def migration(version: int, name: str):
+    """Register a migration function taking an open connection"""
+    def register(function):
+        if any(existing == version for existing, _, _ in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version: {version}")
+        MIGRATIONS.append((version, name, function))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return function
+    return register
+
+
+# ------------------------------------------
+# HELPERS
+# ------------------------------------------
+
+def _column_names(connection, table_name: str) -> set:
+    return {column['name'] for column in inspect(connection).get_columns(table_name)}
+
+
+def _add_missing_columns(connection, table, column_names) -> None:
+    """ALTER TABLE ... ADD COLUMN for model columns the table lacks"""
+    existing = _column_names(connection, table.name)
+    preparer = connection.dialect.identifier_preparer
+    for name in column_names:
+        if name in existing:
+            continue
+        column = table.c[name]
+        ddl = (
+            f"ALTER TABLE {preparer.format_table(table)} "
+            f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=connection.dialect)}"
+        )
+        for foreign_key in column.foreign_keys:
+            target = foreign_key.column
+            ddl += (
+                f" REFERENCES {preparer.format_table(target.table)} "
+                f"({preparer.format_column(target)})"
+            )
+        connection.execute(text(ddl))
+
+
+def has_unique(connection, table_name: str, column_names: List[str]) -> bool:
+    """Whether a unique constraint or index covers exactly these columns"""
+    inspector = inspect(connection)
+    uniques = [constraint['column_names'] for constraint in inspector.get_unique_constraints(table_name)]
+    uniques += [index['column_names'] for index in inspector.get_indexes(table_name) if index['unique']]
+    return any(list(columns) == column_names for columns in uniques)
+
+
+def _recreate_with_shards(connection, table) -> None:
+    """
+    Recreate a counter table from its model, whose unique key now includes
+    a shard column; existing rows become shard 0. Counter tables hold one
+    row per key, so the rows are copied through memory.
+    """
+    if 'shard' in _column_names(connection, table.name):
+        return
+    columns = [column for column in table.columns if column.name not in ('id', 'shard')]
+    rows = connection.execute(select(*columns)).mappings().all()
+    table.drop(connection)
+    table.create(connection)
+    if rows:
+        connection.execute(table.insert(), [dict(row, shard=0) for row in rows])
+
+
+def _create_model_indexes(connection, table) -> None:
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+
+# ------------------------------------------
+# MIGRATIONS
+# ------------------------------------------
+
+@migration(1, "Assessment scoring, variant, segment and snapshot columns")
+def add_assessment_columns(connection):
+    _add_missing_columns(connection, Assessment.__table__, [
+        'scoring_rules_version', 'variant_id', 'ai_stage', 'company_size', 'region',
+        'benchmark_snapshot_id',
+    ])
+
+
+@migration(2, "Unique organization names")
+def unique_organization_names(connection):
+    if has_unique(connection, 'organizations', ['name']):
+        return
+
+    # Merge duplicate organizations into the oldest one with the name
+    duplicates = connection.execute(text(
+        "SELECT o.id, keep.id FROM organizations o "
+        "JOIN (SELECT name, MIN(id) AS id FROM organizations GROUP BY name HAVING COUNT(*) > 1) keep "
+        "ON o.name = keep.name AND o.id <> keep.id"
+    )).all()
+    for duplicate_id, keep_id in duplicates:
+        params = {'duplicate': duplicate_id, 'keep': keep_id}
+        connection.execute(text("UPDATE assessments SET organization_id = :keep WHERE organization_id = :duplicate"), params)
+        connection.execute(text("UPDATE users SET organization_id = :keep WHERE organization_id = :duplicate"), params)
+        connection.execute(text("DELETE FROM organizations WHERE id = :duplicate"), params)
+
+    connection.execute(text("CREATE UNIQUE INDEX uq_organizations_name ON organizations (name)"))
+
+
+@migration(3, "Indexes for organization assessment and user lookups")
+def hot_path_indexes(connection):
+    _create_model_indexes(connection, Assessment.__table__)
+    _create_model_indexes(connection, User.__table__)
+
+
+@migration(4, "Typed dimension score columns on assessments")
+def add_dimension_score_columns(connection):
+    table = Assessment.__table__
+    _add_missing_columns(connection, table, DIMENSION_SCORE_COLUMNS.values())
+
+    # Backfill from the JSON list, which is stored in DIMENSIONS order
+    json_scores = table.c.dimension_scores
+    connection.execute(
+        update(table)
+        .where(table.c[next(iter(DIMENSION_SCORE_COLUMNS.values()))].is_(None))
+        .values({
+            column: json_scores[position]['score'].as_float()
+            for position, column in enumerate(DIMENSION_SCORE_COLUMNS.values())
+        })
+    )
+
+
+@migration(5, "Sharded percentile histograms and daily aggregates")
+def shard_hot_counters(connection):
+    _recreate_with_shards(connection, AnswerHistogram.__table__)
+    _recreate_with_shards(connection, DailyAggregate.__table__)
+
+
+@migration(6, "Seed the benchmark accumulators from the legacy benchmark")
+def seed_benchmark_accumulators(connection):
+    # Once any accumulator row exists the legacy row is no longer read, so
+    # carry its history over as shard 0 (sum = mean * count)
+    accumulators = BenchmarkAccumulator.__table__
+    if connection.execute(select(func.count()).select_from(accumulators)).scalar():
+        return
+
+    benchmarks = Benchmark.__table__
+    latest = connection.execute(
+        select(benchmarks.c.dimension_scores, benchmarks.c.assessment_count)
+        .order_by(benchmarks.c.updated_at.desc())
+        .limit(1)
+    ).first()
+    if latest is None or not latest.assessment_count:
+        return
+
+    count = latest.assessment_count
+    connection.execute(accumulators.insert(), [
+        {'shard': 0, 'metric': dimension['id'], 'count': count, 'sum': float(score) * count}
+        for dimension, score in zip(DIMENSIONS, latest.dimension_scores)
+    ])
+
+
+# ------------------------------------------
+# RUNNER
+# ------------------------------------------
+
+def applied_versions(engine) -> set:
+    with engine.connect() as connection:
+        return set(connection.execute(SchemaMigration.__table__.select().with_only_columns(
+            SchemaMigration.__table__.c.version
+        )).scalars())
+
+
+def missing_columns(engine) -> List[str]:
+    """Model columns ("table.column") absent from existing tables in the database"""
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        tables = set(inspector.get_table_names())
+        missing = []
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            missing += [f"{table.name}.{column.name}" for column in table.columns if column.name not in existing]
+        return missing
+
+
+def migrate(engine) -> List[int]:
+    """
+    Apply pending migrations in version order, then check that every model
+    column exists.
+
+    Returns:
+        Versions applied by this call
+
+    Raises:
+        RuntimeError: a model column has no migration
+    """
+    applied = applied_versions(engine)
+    newly_applied = []
+    for version, name, function in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as connection:
+            function(connection)
+            connection.execute(SchemaMigration.__table__.insert().values(version=version, name=name))
+        print(f"Applied schema migration {version}: {name}")
+        newly_applied.append(version)
+
+    missing = missing_columns(engine)
+    if missing:
+        raise RuntimeError(f"Model columns without a migration: {', '.join(missing)}")
+    return newly_applied
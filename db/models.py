@@ -1,11 +1,14 @@
 """
 Database models for AI Process Readiness Assessment
 """
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, JSON, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, JSON, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from collections.abc import Mapping
 from datetime import datetime
 import os
+import threading
+from db.pool import engine_options, pool_stats
 
 Base = declarative_base()
 
@@ -17,7 +20,7 @@ class Organization(Base):
     __tablename__ = 'organizations'
     
     id = Column(Integer, primary_key=True)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), unique=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -27,6 +30,10 @@ class Organization(Base):
 class Assessment(Base):
     """Assessment results table"""
     __tablename__ = 'assessments'
+    __table_args__ = (
+        # Latest / history / team queries filter by organization, newest first
+        Index('ix_assessments_organization_id_completed_at', 'organization_id', 'completed_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     organization_id = Column(Integer, ForeignKey('organizations.id'), nullable=False)
@@ -35,10 +42,31 @@ class Assessment(Base):
     total_score = Column(Integer, nullable=False)
     percentage = Column(Integer, nullable=False)
     readiness_band = Column(String(50), nullable=False)
+    # Scoring rules version that produced the scores (NULL = before versioning)
+    scoring_rules_version = Column(Integer, nullable=True)
+    # Questionnaire variant answered (NULL = base questionnaire)
+    variant_id = Column(String(50), nullable=True)
+    
+    # Benchmark segments (see data/segments.py)
+    ai_stage = Column(String(100), nullable=True)
+    company_size = Column(String(50), nullable=True)
+    region = Column(String(100), nullable=True)
+    
+    # Benchmark snapshot the results were compared against
+    benchmark_snapshot_id = Column(Integer, ForeignKey('benchmark_snapshots.id'), nullable=True)
     
     # Dimension scores (stored as JSON)
     dimension_scores = Column(JSON, nullable=False)
     
+    # The same dimension scores as typed columns for SQL aggregation (see
+    # DIMENSION_SCORE_COLUMNS); NULL until backfilled on older rows
+    governance_score = Column(Float, nullable=True)
+    leadership_score = Column(Float, nullable=True)
+    data_score = Column(Float, nullable=True)
+    process_score = Column(Float, nullable=True)
+    technology_score = Column(Float, nullable=True)
+    people_score = Column(Float, nullable=True)
+    
     # Individual question answers (stored as JSON)
     answers = Column(JSON, nullable=False)
     
@@ -52,9 +80,30 @@ class Assessment(Base):
     # Relationship
     organization = relationship("Organization", back_populates="assessments")
 
+# Dimension id -> typed Assessment score column, in DIMENSIONS order
+DIMENSION_SCORE_COLUMNS = {
+    'governance': 'governance_score',
+    'leadership': 'leadership_score',
+    'data': 'data_score',
+    'process': 'process_score',
+    'technology': 'technology_score',
+    'people': 'people_score',
+}
+
+def dimension_score_values(dimension_scores) -> dict:
+    """Typed column values for a dimension_scores list ({'id', 'score', ...} dicts)"""
+    return {
+        DIMENSION_SCORE_COLUMNS[dim_score['id']]: float(dim_score['score'])
+        for dim_score in dimension_scores
+        if isinstance(dim_score, Mapping) and dim_score.get('id') in DIMENSION_SCORE_COLUMNS
+    }
+
 class User(Base):
     """User table for multi-user support"""
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('ix_users_email_organization_id', 'email', 'organization_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     organization_id = Column(Integer, ForeignKey('organizations.id'), nullable=True)
@@ -77,22 +126,156 @@ class Benchmark(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class SchemaMigration(Base):
+    """Schema migrations applied to this database (see db/migrations.py)"""
+    __tablename__ = 'schema_migrations'
+    
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(255), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+class BenchmarkSnapshot(Base):
+    """Immutable copy of every benchmark profile; the id is the snapshot version"""
+    __tablename__ = 'benchmark_snapshots'
+    
+    id = Column(Integer, primary_key=True)
+    # Benchmark name -> profile ({dimension id: score, 'total': ..., 'description': ...})
+    benchmarks = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class BenchmarkAccumulator(Base):
+    """
+    Sharded running count and sum of one dimension score for the moving
+    average benchmark. Writers increment a random shard in place; readers
+    add up the shards.
+    """
+    __tablename__ = 'benchmark_accumulators'
+    __table_args__ = (UniqueConstraint('shard', 'metric', name='uq_benchmark_accumulators_shard_metric'),)
+    
+    id = Column(Integer, primary_key=True)
+    shard = Column(Integer, nullable=False)
+    # Dimension id
+    metric = Column(String(50), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    sum = Column(Float, nullable=False, default=0.0)
+
+class AnswerHistogram(Base):
+    """
+    Answer and score histogram buckets for the percentile engine, sharded
+    like BenchmarkAccumulator; readers add up the shards.
+    """
+    __tablename__ = 'answer_histograms'
+    __table_args__ = (
+        UniqueConstraint('series', 'bucket', 'shard', name='uq_answer_histograms_series_bucket_shard'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    shard = Column(Integer, nullable=False, default=0)
+    # 'question:<id>', 'dimension:<id>' or 'total' (see utils/percentiles.py)
+    series = Column(String(100), nullable=False)
+    # Answer value, joint answer cell or total score
+    bucket = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+class SegmentAggregate(Base):
+    """Running (count, sum, sum of squares) of one score metric within a benchmark segment"""
+    __tablename__ = 'segment_aggregates'
+    __table_args__ = (
+        UniqueConstraint('segment', 'value', 'metric', name='uq_segment_aggregates_segment_value_metric'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    # Segment type ('stage', 'size', 'region') and value
+    segment = Column(String(20), nullable=False)
+    value = Column(String(100), nullable=False)
+    # Dimension id or 'total'
+    metric = Column(String(50), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    sum = Column(Float, nullable=False, default=0.0)
+    sum_squares = Column(Float, nullable=False, default=0.0)
+
+class DailyAggregate(Base):
+    """
+    Per-day (count, sum, sum of squares) of one score metric for windowed
+    benchmarks, sharded like BenchmarkAccumulator; readers add up the shards.
+    """
+    __tablename__ = 'daily_aggregates'
+    __table_args__ = (UniqueConstraint('day', 'metric', 'shard', name='uq_daily_aggregates_day_metric_shard'),)
+    
+    id = Column(Integer, primary_key=True)
+    shard = Column(Integer, nullable=False, default=0)
+    # UTC completion date
+    day = Column(Date, nullable=False)
+    # Dimension id or 'total'
+    metric = Column(String(50), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    sum = Column(Float, nullable=False, default=0.0)
+    sum_squares = Column(Float, nullable=False, default=0.0)
+
+class JobCheckpoint(Base):
+    """Progress marker for resumable batch jobs (e.g. bulk rescoring)"""
+    __tablename__ = 'job_checkpoints'
+    
+    job_name = Column(String(100), primary_key=True)
+    # Highest primary key fully processed so far
+    last_id = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
 # Database connection and session management
-def get_db_engine():
-    """Get database engine"""
+
+# One engine (and connection pool) and sessionmaker per process, created on
+# first use as (database url, engine, sessionmaker); recreated only if
+# DATABASE_URL changes
+_engine_state = None
+_engine_lock = threading.Lock()
+
+def _get_engine_state():
+    global _engine_state
     database_url = os.environ.get('DATABASE_URL')
     if not database_url:
         raise ValueError("DATABASE_URL environment variable not set")
-    return create_engine(database_url)
+
+    state = _engine_state
+    if state is not None and state[0] == database_url:
+        return state
+
+    with _engine_lock:
+        if _engine_state is None or _engine_state[0] != database_url:
+            if _engine_state is not None:
+                _engine_state[1].dispose()
+            engine = create_engine(database_url, **engine_options(database_url))
+            _engine_state = (database_url, engine, sessionmaker(bind=engine))
+        return _engine_state
+
+def get_db_engine():
+    """Get the process-wide database engine (pool configured in db/pool.py)"""
+    return _get_engine_state()[1]
 
 def get_db_session():
     """Get database session"""
-    engine = get_db_engine()
-    Session = sessionmaker(bind=engine)
-    return Session()
+    return _get_engine_state()[2]()
+
+def dispose_db_engine():
+    """Close every pooled connection and drop the engine"""
+    global _engine_state
+    with _engine_lock:
+        if _engine_state is not None:
+            _engine_state[1].dispose()
+        _engine_state = None
+
+def get_db_pool_stats():
+    """Connection pool gauges and checkout latency for the process-wide engine"""
+    return pool_stats(get_db_engine())
 
 def init_db():
-    """Initialize database - create all tables"""
+    """Initialize database - create all tables, then apply pending migrations"""
+    from db.migrations import migrate
+    
     engine = get_db_engine()
     Base.metadata.create_all(engine)
+    migrate(engine)
     return engine
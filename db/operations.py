@@ -1,10 +1,27 @@
 """
 Database operations for AI Process Readiness Assessment
 """
-from db.models import Organization, Assessment, User, Benchmark, get_db_session, init_db, DEFAULT_BASELINE
-from datetime import datetime
-from sqlalchemy import desc, func
-from typing import List, Dict, Optional
+from db.models import Organization, Assessment, User, Benchmark, BenchmarkAccumulator, BenchmarkSnapshot, AnswerHistogram, SegmentAggregate, DailyAggregate, get_db_session, init_db, DEFAULT_BASELINE, DIMENSION_SCORE_COLUMNS, dimension_score_values
+from collections.abc import Mapping
+import os
+import random
+from datetime import date, datetime
+from sqlalchemy import case, desc, func, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from typing import List, Dict, Optional, Sequence, Tuple
+from data.dimensions import DIMENSIONS
+from utils.benchmark_cache import invalidate_benchmark_cache
+from utils.percentiles import ScoreHistograms
+from utils.scoring_plan import CURRENT_SCORING_RULES_VERSION, DEFAULT_VARIANT_ID
+from utils.variants import get_variant
+
+# Counter rows per dimension for the moving average benchmark; writers pick
+# one at random so concurrent completions rarely wait on the same row
+BENCHMARK_SHARDS = int(os.environ.get('BENCHMARK_SHARDS', 8))
+
+# Counter rows per key for the percentile histograms and daily aggregates,
+# which every completion updates inside its save transaction
+AGGREGATE_SHARDS = int(os.environ.get('AGGREGATE_SHARDS', 8))
 
 def ensure_tables_exist():
     """Ensure database tables are created"""
@@ -15,101 +32,213 @@ def ensure_tables_exist():
         print(f"Error initializing database: {e}")
         return False
 
+# ------------------------------------------
+# UPSERTS
+# ------------------------------------------
+
+# (database, table, columns) known to have the unique index ON CONFLICT needs
+_conflict_targets = set()
+
+def _has_conflict_target(session, model, conflict_columns: Sequence[str]) -> bool:
+    """
+    Whether the conflict columns are unique in this database. Databases
+    created before migration 2 lack the unique organizations.name index
+    until init_db migrates them; a positive answer is cached.
+    """
+    from db.migrations import has_unique
+    
+    key = (str(session.get_bind().url), model.__tablename__, tuple(conflict_columns))
+    if key in _conflict_targets:
+        return True
+    if not has_unique(session.connection(), model.__tablename__, list(conflict_columns)):
+        return False
+    _conflict_targets.add(key)
+    return True
+
+def _upsert_returning_id(session, model, values: Dict, conflict_columns: Sequence[str],
+                         update_columns: Sequence[str]) -> int:
+    """
+    Insert a row or update the existing one with the same conflict key, in
+    one statement where the dialect supports INSERT ... ON CONFLICT ...
+    RETURNING (PostgreSQL, SQLite) and the conflict columns are unique.
+    
+    Returns:
+        The row's id
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite') and _has_conflict_target(session, model, conflict_columns):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(model).values(**values)
+        # DO UPDATE (not DO NOTHING) so RETURNING also yields existing rows
+        statement = statement.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: statement.excluded[column] for column in update_columns}
+        ).returning(model.id)
+        return session.execute(statement).scalar_one()
+    
+    # Otherwise: look up, then insert in a savepoint; if a concurrent
+    # submission inserted the same key first, use its row instead
+    key = {column: values[column] for column in conflict_columns}
+    
+    def update_existing():
+        row_id = session.query(model.id).filter_by(**key).order_by(model.id).limit(1).scalar()
+        if row_id is not None:
+            session.query(model).filter_by(id=row_id).update(
+                {column: values[column] for column in update_columns}, synchronize_session=False
+            )
+        return row_id
+    
+    row_id = update_existing()
+    if row_id is not None:
+        return row_id
+    try:
+        with session.begin_nested():
+            row = model(**values)
+            session.add(row)
+        return row.id
+    except IntegrityError:
+        return update_existing()
+
+def upsert_organization(session, company_name: str) -> int:
+    """Id of the organization with this name, created if needed (not committed)"""
+    return _upsert_returning_id(
+        session, Organization, {'name': company_name}, ['name'], ['name']
+    )
+
+def upsert_user(session, name: str, email: str, organization_id: int) -> int:
+    """
+    Id of the user with this email, created in the organization if needed
+    (not committed). Emails are unique across organizations, so an
+    existing user who submits for another organization moves to it and
+    their name is updated; their earlier assessments stay with the
+    organization they were submitted for.
+    """
+    return _upsert_returning_id(
+        session, User,
+        {'name': name, 'email': email, 'organization_id': organization_id},
+        ['email'], ['name', 'organization_id']
+    )
+
 def get_or_create_organization(company_name: str) -> Organization:
     """Get existing organization or create new one"""
     session = get_db_session()
+    session.expire_on_commit = False
     try:
-        org = session.query(Organization).filter_by(name=company_name).first()
-        if not org:
-            org = Organization(name=company_name)
-            session.add(org)
-            session.commit()
-            session.refresh(org)
-        return org
+        org_id = upsert_organization(session, company_name)
+        session.commit()
+        return session.get(Organization, org_id)
+    except Exception as e:
+        session.rollback()
+        raise e
     finally:
         session.close()
 
 def get_or_create_user(name: str, email: str, organization_id: int) -> User:
     """Get existing user or create new one"""
     session = get_db_session()
+    session.expire_on_commit = False
     try:
-        user = session.query(User).filter_by(email=email, organization_id=organization_id).first()
-        if not user:
-            user = User(
-                name=name,
-                email=email,
-                organization_id=organization_id
-            )
-            session.add(user)
-            session.commit()
-            session.refresh(user)
-        return user
+        user_id = upsert_user(session, name, email, organization_id)
+        session.commit()
+        return session.get(User, user_id)
+    except Exception as e:
+        session.rollback()
+        raise e
     finally:
         session.close()
 
+# ------------------------------------------
+# ASSESSMENTS
+# ------------------------------------------
+
 def save_assessment(
     company_name: str,
     scores_data: Dict,
     answers: Dict,
     primary_color: str = '#BF6A16',
     user_name: str = None,
-    user_email: str = None
+    user_email: str = None,
+    segments: Optional[Dict[str, str]] = None,
+    benchmark_snapshot_id: Optional[int] = None
 ) -> Assessment:
-    """Save assessment results to database"""
+    """
+    Save assessment results to database
+    
+    The organization and user upserts, the assessment and every benchmark
+    aggregate are written in one transaction. The moving-average benchmark
+    contribution joins that transaction unless write-behind batching is on
+    (see db/benchmark_writer.py), in which case it is buffered after commit.
+    
+    segments maps segment type to value (see data/segments.py); the
+    assessment is added to those segment benchmarks.
+    benchmark_snapshot_id records the benchmark snapshot the results are
+    compared against.
+    """
+    from db.benchmark_writer import submit_benchmark_contribution, write_behind_enabled
+    
+    segments = segments or {}
     session = get_db_session()
+    # The returned assessment stays readable without a refresh query
+    session.expire_on_commit = False
     try:
-        # Get or create organization
-        org = session.query(Organization).filter_by(name=company_name).first()
-        if not org:
-            org = Organization(name=company_name)
-            session.add(org)
-            session.commit()
-            session.refresh(org)
+        org_id = upsert_organization(session, company_name)
         
-        # Get or create user if provided (in same session)
         user_id = None
         if user_name and user_email:
-            user = session.query(User).filter_by(email=user_email, organization_id=org.id).first()
-            if not user:
-                user = User(
-                    name=user_name,
-                    email=user_email,
-                    organization_id=org.id
-                )
-                session.add(user)
-                session.commit()
-                session.refresh(user)
-            user_id = user.id
+            user_id = upsert_user(session, user_name, user_email, org_id)
         
         # Create assessment
         assessment = Assessment(
-            organization_id=org.id,
+            organization_id=org_id,
             user_id=user_id,
             company_name=company_name,
             total_score=scores_data['total'],
             percentage=scores_data['percentage'],
             readiness_band=scores_data['readiness_band']['label'],
-            dimension_scores=scores_data['dimension_scores'],
+            scoring_rules_version=scores_data.get('scoring_rules_version', CURRENT_SCORING_RULES_VERSION),
+            variant_id=scores_data.get('variant_id', DEFAULT_VARIANT_ID),
+            dimension_scores=[dict(dim_score) for dim_score in scores_data['dimension_scores']],
             answers=answers,
-            primary_color=primary_color
+            primary_color=primary_color,
+            **dimension_score_values(scores_data['dimension_scores']),
+            ai_stage=segments.get('stage'),
+            company_size=segments.get('size'),
+            region=segments.get('region'),
+            benchmark_snapshot_id=benchmark_snapshot_id
         )
         
-        session.add(assessment)
-        session.commit()
-        session.refresh(assessment)
-        
-        # Update the moving average benchmark if this is not an outlier
         # Extract raw dimension scores from the dimension_scores list
         raw_dimension_scores = []
         for dim_score in scores_data['dimension_scores']:
-            if isinstance(dim_score, dict):
+            if isinstance(dim_score, Mapping):
                 raw_dimension_scores.append(dim_score.get('score', 3.0))
             else:
                 raw_dimension_scores.append(float(dim_score))
+        outlier = is_outlier_assessment(raw_dimension_scores)
+        buffered = write_behind_enabled()
         
-        # Only update benchmark if not an outlier
-        if not is_outlier_assessment(raw_dimension_scores):
-            update_benchmark(raw_dimension_scores)
+        session.add(assessment)
+        record_score_histograms(session, answers, assessment.variant_id)
+        if not outlier:
+            metric_values = {
+                dim_score['id']: float(dim_score['score'])
+                for dim_score in scores_data['dimension_scores']
+                if isinstance(dim_score, Mapping)
+            }
+            metric_values['total'] = float(scores_data['total'])
+            record_segment_aggregates(session, segments, metric_values)
+            record_daily_aggregates(session, datetime.utcnow().date(), metric_values)
+            if not buffered:
+                record_benchmark_contribution(session, raw_dimension_scores)
+        session.commit()
+        
+        if not outlier:
+            invalidate_benchmark_cache()
+            if buffered:
+                submit_benchmark_contribution(raw_dimension_scores)
         
         return assessment
     except Exception as e:
@@ -170,36 +299,38 @@ def get_assessment_history(company_name: str) -> List[Dict]:
     
     return history
 
-def get_dimension_trends(company_name: str) -> Dict:
-    """Get dimension score trends over time"""
-    assessments = get_organization_assessments(company_name, limit=10)
-    
-    if not assessments:
-        return {}
-    
-    # Organize data by dimension
-    trends = {}
-    dates = []
-    
-    for assessment in reversed(assessments):  # Oldest first
-        date = assessment.completed_at.strftime('%Y-%m-%d')
-        dates.append(date)
+def get_dimension_trends(company_name: str, limit: int = 10) -> Dict:
+    """Get dimension score trends over the latest assessments, oldest first"""
+    session = get_db_session()
+    try:
+        score_columns = [getattr(Assessment, column) for column in DIMENSION_SCORE_COLUMNS.values()]
+        rows = session.query(Assessment.completed_at, *score_columns)\
+            .join(Organization, Organization.id == Assessment.organization_id)\
+            .filter(Organization.name == company_name)\
+            .order_by(desc(Assessment.completed_at))\
+            .limit(limit)\
+            .all()
+        
+        if not rows:
+            return {}
         
-        for dim_score in assessment.dimension_scores:
-            dim_id = dim_score['id']
-            dim_title = dim_score['title']
-            
-            if dim_id not in trends:
-                trends[dim_id] = {
-                    'title': dim_title,
+        trends = {}
+        for row in reversed(rows):  # Oldest first
+            date = row[0].strftime('%Y-%m-%d')
+            for dimension, score in zip(DIMENSIONS, row[1:]):
+                if score is None:
+                    continue
+                trend = trends.setdefault(dimension['id'], {
+                    'title': dimension['title'],
                     'scores': [],
                     'dates': []
-                }
-            
-            trends[dim_id]['scores'].append(dim_score['score'])
-            trends[dim_id]['dates'].append(date)
-    
-    return trends
+                })
+                trend['scores'].append(score)
+                trend['dates'].append(date)
+        
+        return trends
+    finally:
+        session.close()
 
 def get_team_statistics(company_name: str) -> Dict:
     """Get team/organization statistics for a specific company"""
@@ -267,99 +398,83 @@ def delete_assessment(assessment_id: int) -> bool:
         session.close()
 
 def get_team_members(company_name: str) -> List[Dict]:
-    """Get all team members who have completed assessments"""
+    """
+    Get all team members who have completed assessments, newest first.
+    
+    One query: assessments are joined to their organization and users, and
+    window functions pick each user's latest assessment and count theirs.
+    
+    Returns:
+        One dict per user with id, name, email, latest_score,
+        latest_percentage, latest_date and total_assessments
+    """
     session = get_db_session()
     try:
-        org = session.query(Organization).filter_by(name=company_name).first()
-        if not org:
-            return []
-        
-        # Get all assessments with user info
-        assessments = session.query(Assessment).filter_by(organization_id=org.id).all()
-        
-        # Track users and their assessments
-        user_map = {}
-        
-        for assessment in assessments:
-            # Check if assessment has user_id attribute and it's not None
-            if hasattr(assessment, 'user_id') and assessment.user_id:
-                user = session.query(User).filter_by(id=assessment.user_id).first()
-                if user:
-                    if user.id not in user_map:
-                        user_map[user.id] = {
-                            'id': user.id,
-                            'name': user.name,
-                            'email': user.email,
-                            'assessments': [],
-                            'latest_score': 0,
-                            'latest_percentage': 0,
-                            'latest_date': None
-                        }
-                    
-                    user_map[user.id]['assessments'].append({
-                        'score': assessment.total_score,
-                        'percentage': assessment.percentage,
-                        'date': assessment.completed_at
-                    })
-        
-        # Get latest assessment for each user
-        team_members = []
-        for user_id, user_data in user_map.items():
-            latest = max(user_data['assessments'], key=lambda x: x['date'])
-            user_data['latest_score'] = latest['score']
-            user_data['latest_percentage'] = latest['percentage']
-            user_data['latest_date'] = latest['date'].strftime('%Y-%m-%d %H:%M')
-            user_data['total_assessments'] = len(user_data['assessments'])
-            del user_data['assessments']  # Remove detailed assessments
-            team_members.append(user_data)
-        
-        return sorted(team_members, key=lambda x: x['latest_date'], reverse=True)
+        ranked = select(
+            Assessment.user_id,
+            Assessment.total_score,
+            Assessment.percentage,
+            Assessment.completed_at,
+            func.row_number().over(
+                partition_by=Assessment.user_id,
+                order_by=(desc(Assessment.completed_at), desc(Assessment.id))
+            ).label('position'),
+            func.count().over(partition_by=Assessment.user_id).label('total_assessments'),
+        )\
+            .join(Organization, Organization.id == Assessment.organization_id)\
+            .where(Organization.name == company_name, Assessment.user_id.isnot(None))\
+            .subquery()
+        
+        rows = session.execute(
+            select(
+                User.id, User.name, User.email,
+                ranked.c.total_score, ranked.c.percentage, ranked.c.completed_at,
+                ranked.c.total_assessments,
+            )
+            .join(ranked, ranked.c.user_id == User.id)
+            .where(ranked.c.position == 1)
+            .order_by(desc(ranked.c.completed_at))
+        ).all()
+        
+        return [
+            {
+                'id': row.id,
+                'name': row.name,
+                'email': row.email,
+                'latest_score': row.total_score,
+                'latest_percentage': row.percentage,
+                'latest_date': row.completed_at.strftime('%Y-%m-%d %H:%M'),
+                'total_assessments': row.total_assessments
+            }
+            for row in rows
+        ]
     finally:
         session.close()
 
 def get_team_dimension_averages(company_name: str) -> Dict:
-    """Get average dimension scores across all team assessments"""
+    """Get average dimension scores across all team assessments (one SQL aggregate)"""
     session = get_db_session()
     try:
-        org = session.query(Organization).filter_by(name=company_name).first()
-        if not org:
-            return {}
-        
-        assessments = session.query(Assessment).filter_by(organization_id=org.id).all()
-        
-        if not assessments:
-            return {}
-        
-        # Aggregate dimension scores
-        dimension_totals = {}
-        dimension_counts = {}
-        
-        for assessment in assessments:
-            for dim_score in assessment.dimension_scores:
-                dim_id = dim_score['id']
-                dim_title = dim_score['title']
-                
-                if dim_id not in dimension_totals:
-                    dimension_totals[dim_id] = {
-                        'title': dim_title,
-                        'total': 0,
-                        'count': 0
-                    }
-                
-                dimension_totals[dim_id]['total'] += dim_score['score']
-                dimension_totals[dim_id]['count'] += 1
-        
-        # Calculate averages
-        dimension_averages = []
-        for dim_id, data in dimension_totals.items():
-            dimension_averages.append({
-                'id': dim_id,
-                'title': data['title'],
-                'average': round(data['total'] / data['count'], 2),
-                'assessments': data['count']
-            })
-        
-        return dimension_averages
+        score_columns = [getattr(Assessment, column) for column in DIMENSION_SCORE_COLUMNS.values()]
+        row = session.query(
+            *[func.count(column) for column in score_columns],
+            *[func.avg(column) for column in score_columns]
+        )\
+            .join(Organization, Organization.id == Assessment.organization_id)\
+            .filter(Organization.name == company_name)\
+            .one()
+        
+        counts, averages = row[:len(score_columns)], row[len(score_columns):]
+        return [
+            {
+                'id': dimension['id'],
+                'title': dimension['title'],
+                'average': round(float(average), 2),
+                'assessments': count
+            }
+            for dimension, count, average in zip(DIMENSIONS, counts, averages)
+            if count
+        ] or {}
     finally:
         session.close()
 
@@ -367,20 +482,13 @@ def get_team_readiness_distribution(company_name: str) -> Dict:
     """Get distribution of readiness levels across team"""
     session = get_db_session()
     try:
-        org = session.query(Organization).filter_by(name=company_name).first()
-        if not org:
-            return {}
-        
-        assessments = session.query(Assessment).filter_by(organization_id=org.id).all()
-        
-        distribution = {}
-        for assessment in assessments:
-            band = assessment.readiness_band
-            if band not in distribution:
-                distribution[band] = 0
-            distribution[band] += 1
+        rows = session.query(Assessment.readiness_band, func.count())\
+            .join(Organization, Organization.id == Assessment.organization_id)\
+            .filter(Organization.name == company_name)\
+            .group_by(Assessment.readiness_band)\
+            .all()
         
-        return distribution
+        return {band: count for band, count in rows}
     finally:
         session.close()
 
@@ -402,6 +510,26 @@ def is_outlier_assessment(dimension_scores: List[float]) -> bool:
     
     return all_ones or all_fives
 
+def get_benchmark_totals(session) -> Tuple[int, List[float]]:
+    """
+    Merge the benchmark accumulator shards.
+    
+    Returns:
+        (assessment count, per-dimension score sums in DIMENSIONS order)
+    """
+    rows = session.query(
+        BenchmarkAccumulator.metric,
+        func.sum(BenchmarkAccumulator.count),
+        func.sum(BenchmarkAccumulator.sum)
+    )\
+        .group_by(BenchmarkAccumulator.metric)\
+        .all()
+    totals = {metric: (int(count or 0), float(total or 0.0)) for metric, count, total in rows}
+    
+    count = max((metric_count for metric_count, _ in totals.values()), default=0)
+    sums = [totals.get(dimension['id'], (0, 0.0))[1] for dimension in DIMENSIONS]
+    return count, sums
+
 def get_current_benchmark() -> List[float]:
     """
     Get the current moving average benchmark.
@@ -412,6 +540,11 @@ def get_current_benchmark() -> List[float]:
     """
     session = get_db_session()
     try:
+        count, sums = get_benchmark_totals(session)
+        if count:
+            return [dimension_sum / count for dimension_sum in sums]
+        
+        # Benchmark stored before the accumulators existed
         benchmark = session.query(Benchmark).order_by(desc(Benchmark.updated_at)).first()
         
         if benchmark:
@@ -421,50 +554,405 @@ def get_current_benchmark() -> List[float]:
     finally:
         session.close()
 
-def update_benchmark(new_dimension_scores: List[float]) -> Benchmark:
+def record_benchmark_contribution(session, dimension_sums: Sequence[float], count: int = 1) -> None:
+    """
+    Add assessments to the moving average benchmark with one atomic
+    UPDATE of a random shard (count = count + n, sum = sum + x), so
+    concurrent writers never lose updates. Runs inside the caller's
+    session and transaction.
+    
+    Args:
+        session: Open database session
+        dimension_sums: Per-dimension score sums in DIMENSIONS order
+        count: Number of assessments the sums cover
+    """
+    increments = {
+        dimension['id']: float(dimension_sum)
+        for dimension, dimension_sum in zip(DIMENSIONS, dimension_sums)
+    }
+    shard = random.randrange(BENCHMARK_SHARDS)
+    
+    def increment_shard():
+        return session.query(BenchmarkAccumulator)\
+            .filter(BenchmarkAccumulator.shard == shard, BenchmarkAccumulator.metric.in_(list(increments)))\
+            .update({
+                BenchmarkAccumulator.count: BenchmarkAccumulator.count + count,
+                BenchmarkAccumulator.sum: BenchmarkAccumulator.sum + case(increments, value=BenchmarkAccumulator.metric),
+            }, synchronize_session=False)
+    
+    updated = increment_shard()
+    if updated == len(increments):
+        return
+    
+    if updated == 0:
+        # First write to this shard: create its rows, then increment them. A
+        # concurrent writer may create them first, which the savepoint absorbs.
+        try:
+            with session.begin_nested():
+                session.add_all(
+                    BenchmarkAccumulator(shard=shard, metric=metric, count=0, sum=0.0)
+                    for metric in increments
+                )
+        except IntegrityError:
+            pass
+        increment_shard()
+    else:
+        # Dimensions added since the shard was created
+        existing = set(
+            metric for (metric,) in session.query(BenchmarkAccumulator.metric)
+            .filter(BenchmarkAccumulator.shard == shard)
+            .all()
+        )
+        session.add_all(
+            BenchmarkAccumulator(shard=shard, metric=metric, count=count, sum=value)
+            for metric, value in increments.items() if metric not in existing
+        )
+
+def update_benchmark(new_dimension_scores: List[float]) -> None:
     """
     Update the moving average benchmark with new dimension scores.
-    Calculates the new benchmark as a moving average.
+    The sums and count are accumulated in SQL; the average is computed
+    on read by get_current_benchmark.
     
     Args:
         new_dimension_scores: List of 6 dimension scores from the latest assessment
+    """
+    session = get_db_session()
+    try:
+        record_benchmark_contribution(session, new_dimension_scores)
+        session.commit()
+        # Readers in this process pick up the new benchmark immediately
+        invalidate_benchmark_cache()
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+def save_benchmark_snapshot(benchmarks: Dict[str, Dict]) -> Dict:
+    """
+    Store a new immutable benchmark snapshot.
+    
+    Args:
+        benchmarks: Benchmark name -> profile
         
     Returns:
-        Updated Benchmark object
+        Snapshot dict with id (the version), created_at and benchmarks
     """
     session = get_db_session()
     try:
-        # Get the current benchmark
-        benchmark = session.query(Benchmark).order_by(desc(Benchmark.updated_at)).first()
-        
-        if not benchmark:
-            # Create new benchmark with the default baseline
-            benchmark = Benchmark(
-                dimension_scores=DEFAULT_BASELINE.copy(),
-                assessment_count=0
-            )
-            session.add(benchmark)
-            session.commit()
-            session.refresh(benchmark)
-        
-        # Calculate moving average
-        current_scores = benchmark.dimension_scores
-        current_count = benchmark.assessment_count
+        snapshot = BenchmarkSnapshot(benchmarks=benchmarks)
+        session.add(snapshot)
+        session.commit()
+        session.refresh(snapshot)
+        return _snapshot_dict(snapshot)
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+def get_benchmark_snapshot_by_id(snapshot_id: Optional[int] = None) -> Optional[Dict]:
+    """
+    Get one benchmark snapshot, or the latest when snapshot_id is None.
+    
+    Returns:
+        Snapshot dict, or None if it does not exist
+    """
+    session = get_db_session()
+    try:
+        if snapshot_id is None:
+            snapshot = session.query(BenchmarkSnapshot).order_by(desc(BenchmarkSnapshot.id)).first()
+        else:
+            snapshot = session.get(BenchmarkSnapshot, snapshot_id)
+        return _snapshot_dict(snapshot) if snapshot else None
+    finally:
+        session.close()
+
+def _snapshot_dict(snapshot: BenchmarkSnapshot) -> Dict:
+    return {
+        'id': snapshot.id,
+        'created_at': snapshot.created_at,
+        'benchmarks': snapshot.benchmarks,
+    }
+
+def _create_counter_rows(session, rows) -> None:
+    """
+    Insert zeroed aggregate rows that were missing when their UPDATE ran.
+    A concurrent transaction may create the same keys first; the savepoints
+    absorb that unique violation instead of failing the caller's
+    transaction, and the caller then repeats its UPDATE for these keys.
+    """
+    try:
+        with session.begin_nested():
+            session.add_all(rows)
+    except IntegrityError:
+        # Some keys already exist: create the others one at a time
+        for row in rows:
+            try:
+                with session.begin_nested():
+                    session.add(row)
+            except IntegrityError:
+                pass
+
+def record_score_histograms(session, answers: Dict, variant_id: Optional[str] = None) -> bool:
+    """
+    Fold one completed assessment into the percentile histograms, in one
+    random shard (see AGGREGATE_SHARDS) so concurrent completions rarely
+    wait on the same bucket rows. Runs inside the caller's session so it
+    commits with the assessment.
+    
+    Args:
+        session: Open database session
+        answers: Question id -> answer (1-5)
+        variant_id: Questionnaire variant answered (base questionnaire if None)
         
-        # New moving average = (old_average * count + new_score) / (count + 1)
-        updated_scores = []
-        for i, new_score in enumerate(new_dimension_scores):
-            old_avg = current_scores[i] if i < len(current_scores) else 3.0
-            new_avg = (old_avg * current_count + new_score) / (current_count + 1)
-            updated_scores.append(round(new_avg, 2))
+    Returns:
+        True if the answers were complete and recorded
+    """
+    histograms = ScoreHistograms(get_variant(variant_id).plan)
+    buckets = histograms.stored_buckets(histograms.buckets(answers))
+    if not buckets:
+        return False
+    
+    key = tuple_(AnswerHistogram.series, AnswerHistogram.bucket)
+    shard = random.randrange(AGGREGATE_SHARDS)
+    
+    def increment(bucket_keys):
+        return session.query(AnswerHistogram)\
+            .filter(AnswerHistogram.shard == shard, key.in_(bucket_keys))\
+            .update({AnswerHistogram.count: AnswerHistogram.count + 1}, synchronize_session=False)
+    
+    if increment(buckets) < len(buckets):
+        existing = set(
+            session.query(AnswerHistogram.series, AnswerHistogram.bucket)
+            .filter(AnswerHistogram.shard == shard, key.in_(buckets))
+            .all()
+        )
+        missing = [bucket_key for bucket_key in buckets if tuple(bucket_key) not in existing]
+        _create_counter_rows(session, [
+            AnswerHistogram(series=series, bucket=bucket, shard=shard, count=0)
+            for series, bucket in missing
+        ])
+        increment(missing)
+    return True
+
+def record_segment_aggregates(session, segments: Dict[str, str], metric_values: Dict[str, float]) -> bool:
+    """
+    Add one assessment to the (count, sum, sum of squares) rows of each of
+    its segments. Runs inside the caller's session so it commits with the
+    assessment; existing rows are incremented with a single UPDATE, and
+    missing rows are created (see _create_counter_rows) and then incremented.
+    
+    Args:
+        session: Open database session
+        segments: Segment type -> value
+        metric_values: Dimension id (and 'total') -> score
         
-        benchmark.dimension_scores = updated_scores
-        benchmark.assessment_count = current_count + 1
-        benchmark.updated_at = datetime.utcnow()
+    Returns:
+        True if any segment rows were written
+    """
+    keys = [
+        (segment, value, metric)
+        for segment, value in segments.items()
+        for metric in metric_values
+    ]
+    if not keys:
+        return False
+    
+    increment = case(metric_values, value=SegmentAggregate.metric)
+    increment_squares = case(
+        {metric: score * score for metric, score in metric_values.items()},
+        value=SegmentAggregate.metric
+    )
+    key = tuple_(SegmentAggregate.segment, SegmentAggregate.value, SegmentAggregate.metric)
+    
+    def add_assessment(row_keys):
+        return session.query(SegmentAggregate)\
+            .filter(key.in_(row_keys))\
+            .update({
+                SegmentAggregate.count: SegmentAggregate.count + 1,
+                SegmentAggregate.sum: SegmentAggregate.sum + increment,
+                SegmentAggregate.sum_squares: SegmentAggregate.sum_squares + increment_squares,
+            }, synchronize_session=False)
+    
+    if add_assessment(keys) < len(keys):
+        existing = set(
+            session.query(SegmentAggregate.segment, SegmentAggregate.value, SegmentAggregate.metric)
+            .filter(key.in_(keys))
+            .all()
+        )
+        missing = [row_key for row_key in keys if row_key not in existing]
+        _create_counter_rows(session, [
+            SegmentAggregate(segment=segment, value=value, metric=metric, count=0, sum=0.0, sum_squares=0.0)
+            for segment, value, metric in missing
+        ])
+        add_assessment(missing)
+    return True
+
+def record_daily_aggregates(session, day: date, metric_values: Dict[str, float]) -> bool:
+    """
+    Add one assessment to its day's (count, sum, sum of squares) rows in
+    one random shard (see AGGREGATE_SHARDS). Runs inside the caller's
+    session so it commits with the assessment.
+    
+    Args:
+        session: Open database session
+        day: UTC completion date
+        metric_values: Dimension id (and 'total') -> score
         
+    Returns:
+        True if any rows were written
+    """
+    if not metric_values:
+        return False
+    
+    increment = case(metric_values, value=DailyAggregate.metric)
+    increment_squares = case(
+        {metric: score * score for metric, score in metric_values.items()},
+        value=DailyAggregate.metric
+    )
+    shard = random.randrange(AGGREGATE_SHARDS)
+    
+    def add_assessment(metrics):
+        return session.query(DailyAggregate)\
+            .filter(DailyAggregate.day == day, DailyAggregate.shard == shard, DailyAggregate.metric.in_(metrics))\
+            .update({
+                DailyAggregate.count: DailyAggregate.count + 1,
+                DailyAggregate.sum: DailyAggregate.sum + increment,
+                DailyAggregate.sum_squares: DailyAggregate.sum_squares + increment_squares,
+            }, synchronize_session=False)
+    
+    if add_assessment(list(metric_values)) < len(metric_values):
+        existing = set(
+            metric for (metric,) in session.query(DailyAggregate.metric)
+            .filter(
+                DailyAggregate.day == day, DailyAggregate.shard == shard,
+                DailyAggregate.metric.in_(list(metric_values))
+            )
+            .all()
+        )
+        missing = [metric for metric in metric_values if metric not in existing]
+        # The first completions of a UTC day race to create its rows
+        _create_counter_rows(session, [
+            DailyAggregate(day=day, metric=metric, shard=shard, count=0, sum=0.0, sum_squares=0.0)
+            for metric in missing
+        ])
+        add_assessment(missing)
+    return True
+
+def get_daily_aggregate_rows(since: date) -> List[Tuple[date, str, int, float, float]]:
+    """
+    Get the daily aggregate rows from a date onwards, with the shards
+    added up (one row per day and metric, so a year is a few thousand
+    small rows).
+    
+    Returns:
+        List of (day, metric, count, sum, sum of squares) rows
+    """
+    session = get_db_session()
+    try:
+        rows = session.query(
+            DailyAggregate.day,
+            DailyAggregate.metric,
+            func.sum(DailyAggregate.count),
+            func.sum(DailyAggregate.sum),
+            func.sum(DailyAggregate.sum_squares)
+        )\
+            .filter(DailyAggregate.day >= since)\
+            .group_by(DailyAggregate.day, DailyAggregate.metric)\
+            .all()
+        return [
+            (day, metric, int(count), float(total), float(squares))
+            for day, metric, count, total, squares in rows
+        ]
+    finally:
+        session.close()
+
+def get_segment_aggregates(segment: str, value: str) -> Dict[str, Tuple[int, float, float]]:
+    """
+    Get the aggregate rows of one segment.
+    
+    Returns:
+        Metric (dimension id or 'total') -> (count, sum, sum of squares)
+    """
+    session = get_db_session()
+    try:
+        rows = session.query(
+            SegmentAggregate.metric,
+            SegmentAggregate.count,
+            SegmentAggregate.sum,
+            SegmentAggregate.sum_squares
+        )\
+            .filter_by(segment=segment, value=value)\
+            .all()
+        return {metric: (count, total, squares) for metric, count, total, squares in rows}
+    finally:
+        session.close()
+
+def list_segments(min_count: int = 1) -> List[Tuple[str, str, int]]:
+    """
+    Get all segments with at least min_count assessments.
+    
+    Returns:
+        List of (segment, value, assessment count), largest first per segment type
+    """
+    session = get_db_session()
+    try:
+        return session.query(SegmentAggregate.segment, SegmentAggregate.value, SegmentAggregate.count)\
+            .filter(SegmentAggregate.metric == 'total', SegmentAggregate.count >= min_count)\
+            .order_by(SegmentAggregate.segment, desc(SegmentAggregate.count), SegmentAggregate.value)\
+            .all()
+    finally:
+        session.close()
+
+def get_score_histogram_rows() -> List[Tuple[str, int, int]]:
+    """
+    Get all percentile histogram buckets, with the shards added up.
+    
+    Returns:
+        List of (series, bucket, count) rows
+    """
+    session = get_db_session()
+    try:
+        rows = session.query(AnswerHistogram.series, AnswerHistogram.bucket, func.sum(AnswerHistogram.count))\
+            .group_by(AnswerHistogram.series, AnswerHistogram.bucket)\
+            .all()
+        return [(series, bucket, int(count)) for series, bucket, count in rows]
+    finally:
+        session.close()
+
+def rebuild_score_histograms(batch_size: int = 1000) -> int:
+    """
+    Recompute the percentile histograms from stored assessments, e.g. after
+    a backfill. Streams answers so memory stays bounded.
+    
+    Returns:
+        Number of assessments counted
+    """
+    session = get_db_session()
+    try:
+        # One set of histograms per questionnaire variant
+        histograms_by_variant = {}
+        counted = 0
+        query = session.query(Assessment.answers, Assessment.variant_id)
+        for answers, variant_id in query.yield_per(batch_size):
+            variant_id = variant_id or DEFAULT_VARIANT_ID
+            histograms = histograms_by_variant.get(variant_id)
+            if histograms is None:
+                histograms = ScoreHistograms(get_variant(variant_id).plan)
+                histograms_by_variant[variant_id] = histograms
+            if histograms.add(answers or {}):
+                counted += 1
+        
+        session.query(AnswerHistogram).delete(synchronize_session=False)
+        session.add_all(
+            AnswerHistogram(series=histograms.stored_series(series), bucket=bucket, count=count)
+            for histograms in histograms_by_variant.values()
+            for (series, bucket), count in histograms.counts.items()
+        )
         session.commit()
-        session.refresh(benchmark)
-        return benchmark
+        return counted
     except Exception as e:
         session.rollback()
         raise e
@@ -0,0 +1,132 @@
+"""
+Connection pool configuration and metrics.
+
+The process shares one engine (see db.models.get_db_engine). Its pool is
+configured from the environment:
+
+    DB_POOL_SIZE       connections kept open (default 5)
+    DB_MAX_OVERFLOW    extra connections opened under load (default 10)
+    DB_POOL_TIMEOUT    seconds to wait for a free connection (default 30)
+    DB_POOL_RECYCLE    seconds before a connection is replaced (default 1800)
+    DB_POOL_PRE_PING   test connections on checkout (default on)
+
+pool_stats(engine), or db.models.get_db_pool_stats() for the process-wide
+engine, reports checkout latency and the in-use and overflow gauges for
+tuning these under load.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800
+
+# Checkout latencies kept for the percentiles
+LATENCY_SAMPLES = 2048
+
+
+class PoolMetrics:
+    """Checkout counters and a rolling window of checkout latencies"""
+
+    def __init__(self, samples: int = LATENCY_SAMPLES):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=samples)
+        self.checkouts = 0
+        self.timeouts = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+            self.checkouts += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def latency_ms(self) -> dict:
+        with self._lock:
+            latencies = np.array(self._latencies, dtype=np.float64) * 1000
+        if not latencies.size:
+            return {'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+        p50, p99 = np.percentile(latencies, [50, 99])
+        return {'p50': round(float(p50), 3), 'p99': round(float(p99), 3), 'max': round(float(latencies.max()), 3)}
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that times every checkout, including waits and pre-ping"""
+
+    def __init__(self, *args, max_overflow: int = DEFAULT_MAX_OVERFLOW, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # Configured overflow limit, for pool_stats
+        self.max_overflow = max_overflow
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() not in ('0', 'false', 'no', 'off')
+
+
+def engine_options(database_url: str) -> dict:
+    """create_engine keyword arguments for the configured pool"""
+    options = {
+        'pool_pre_ping': _env_flag('DB_POOL_PRE_PING', True),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', DEFAULT_POOL_RECYCLE)),
+    }
+
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        # In-memory SQLite keeps its single connection per thread
+        return options
+
+    options.update(
+        poolclass=MeteredQueuePool,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', DEFAULT_POOL_SIZE)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW)),
+        pool_timeout=float(os.environ.get('DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT)),
+    )
+    return options
+
+
+def pool_stats(engine) -> dict:
+    """Gauges and checkout metrics for an engine's pool"""
+    pool = engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        return {'pool': type(pool).__name__}
+
+    return {
+        'pool': type(pool).__name__,
+        'pool_size': pool.size(),
+        'max_overflow': pool.max_overflow,
+        'in_use': pool.checkedout(),
+        'idle': pool.checkedin(),
+        'overflow': max(pool.overflow(), 0),
+        'checkouts': pool.metrics.checkouts,
+        'timeouts': pool.metrics.timeouts,
+        'checkout_ms': pool.metrics.latency_ms(),
+    }
@@ -0,0 +1,174 @@
+"""
+Resumable bulk rescoring of stored assessments.
+
+When the scoring rules change, stored total_score, percentage,
+readiness_band and dimension_scores go stale. rescore_assessments walks the
+assessments table in primary-key order, scores each chunk in one vectorized
+batch per questionnaire variant and rule version, writes changed rows back
+with a bulk UPDATE and records a checkpoint in the same transaction, so an
+interrupted run resumes after the last committed chunk. Only one chunk is
+held in memory at a time.
+"""
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import update
+
+from db.models import Assessment, JobCheckpoint, dimension_score_values, get_db_session
+from utils.scoring_plan import get_scoring_plan
+from utils.variants import get_stored_variant_plan, get_variant_scoring_plan, is_default_variant
+
+DEFAULT_JOB_NAME = 'rescore_assessments'
+
+
+def _scored_rows(rows, rules_version=None) -> list:
+    """
+    Score one chunk of (id, answers, total, percentage, band, version,
+    variant) rows and return the rows whose stored values changed.
+    
+    Every row is scored with its own questionnaire variant. With
+    rules_version None every row keeps the version stamped on it; variant
+    rows whose definition has moved to a new rules version are left as
+    stored, since their old rules are gone. With a rules_version,
+    base-questionnaire rows move to that version and variant rows to their
+    definition's current rules. Rows are grouped by compiled plan (variant
+    and version) so each group is one batch.
+    """
+    groups = {}
+    for index, row in enumerate(rows):
+        if rules_version is None:
+            try:
+                plan = get_stored_variant_plan(row[6], row[5])
+            except KeyError:
+                continue
+        elif is_default_variant(row[6]):
+            plan = get_scoring_plan(rules_version)
+        else:
+            plan = get_variant_scoring_plan(row[6])
+        groups.setdefault(plan, []).append(index)
+    
+    changes = []
+    for plan, indexes in groups.items():
+        batch = plan.score_batch([rows[index][1] or {} for index in indexes])
+        
+        for position, index in enumerate(indexes):
+            assessment_id, _, old_total, old_percentage, old_band, old_version, _ = rows[index]
+            raw_scores = [float(score) for score in batch['raw_dimension_scores'][position]]
+            if batch['governance_override'][position]:
+                band_label = plan.restricted_band['label']
+            else:
+                band_label = plan.bands[batch['band_code'][position]]['label']
+            total = int(round(float(batch['total'][position])))
+            percentage = int(batch['percentage'][position])
+            
+            if (total, percentage, band_label, old_version) == \
+                    (old_total, old_percentage, old_band, plan.version):
+                continue
+            
+            dimension_scores = [
+                {'id': dim_id, 'title': title, 'score': score}
+                for dim_id, title, score in zip(plan.dimension_ids, plan.dimension_titles, raw_scores)
+            ]
+            changes.append({
+                'id': assessment_id,
+                'total_score': total,
+                'percentage': percentage,
+                'readiness_band': band_label,
+                'scoring_rules_version': plan.version,
+                'dimension_scores': dimension_scores,
+                **dimension_score_values(dimension_scores),
+            })
+    return changes
+
+
+def rescore_assessments(
+    chunk_size: int = 5000,
+    job_name: str = DEFAULT_JOB_NAME,
+    restart: bool = False,
+    rules_version: Optional[int] = None,
+    progress: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    Rescore all stored assessments.
+    
+    Args:
+        chunk_size: Rows scored and written per transaction
+        job_name: Checkpoint key; runs with the same name resume each other
+        restart: Ignore any existing checkpoint and start from the first row
+        rules_version: Rescore (and restamp) every base-questionnaire row
+                       with this rules version; None keeps each row's own
+                       version
+        progress: Optional callback receiving the summary after each chunk
+        
+    Returns:
+        Summary dict with last_id, processed, updated and completed flag
+    """
+    if rules_version is not None:
+        # Fail before touching any rows if the version is unknown
+        get_scoring_plan(rules_version)
+    
+    session = get_db_session()
+    try:
+        checkpoint = session.get(JobCheckpoint, job_name)
+        if checkpoint is None:
+            checkpoint = JobCheckpoint(job_name=job_name, last_id=0, processed=0, updated=0)
+            session.add(checkpoint)
+        elif restart:
+            checkpoint.last_id = 0
+            checkpoint.processed = 0
+            checkpoint.updated = 0
+            checkpoint.started_at = datetime.utcnow()
+        checkpoint.completed_at = None
+        session.commit()
+        
+        while True:
+            rows = session.query(
+                Assessment.id,
+                Assessment.answers,
+                Assessment.total_score,
+                Assessment.percentage,
+                Assessment.readiness_band,
+                Assessment.scoring_rules_version,
+                Assessment.variant_id
+            )\
+                .filter(Assessment.id > checkpoint.last_id)\
+                .order_by(Assessment.id)\
+                .limit(chunk_size)\
+                .all()
+            
+            if not rows:
+                break
+            
+            changes = _scored_rows(rows, rules_version)
+            if changes:
+                session.execute(update(Assessment), changes)
+            
+            checkpoint.last_id = rows[-1][0]
+            checkpoint.processed += len(rows)
+            checkpoint.updated += len(changes)
+            session.commit()
+            # Drop the chunk's ORM state before loading the next one
+            session.expunge_all()
+            checkpoint = session.get(JobCheckpoint, job_name)
+            
+            if progress:
+                progress(_summary(checkpoint))
+        
+        checkpoint.completed_at = datetime.utcnow()
+        session.commit()
+        return _summary(checkpoint)
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+
+def _summary(checkpoint: JobCheckpoint) -> Dict:
+    return {
+        'job_name': checkpoint.job_name,
+        'last_id': checkpoint.last_id,
+        'processed': checkpoint.processed,
+        'updated': checkpoint.updated,
+        'completed': checkpoint.completed_at is not None,
+    }
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Load test for the database connection pool.
+
+Runs concurrent workers that each open a session and read the benchmark
+accumulators, like Streamlit sessions rendering results, then prints the
+pool gauges and checkout latency. Tune DB_POOL_SIZE, DB_MAX_OVERFLOW and
+DB_POOL_TIMEOUT against the output.
+
+Usage:
+    DATABASE_URL=... python scripts/bench_db_pool.py [--workers 32] [--requests 50]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.models import get_db_pool_stats, get_db_session, init_db
+from db.operations import get_benchmark_totals
+
+
+def worker(requests):
+    for _ in range(requests):
+        session = get_db_session()
+        try:
+            get_benchmark_totals(session)
+        finally:
+            session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="requests per worker")
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.workers) as executor:
+        for future in [executor.submit(worker, args.requests) for _ in range(args.workers)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    total = args.workers * args.requests
+    print(f"{total:,} requests from {args.workers} workers in {elapsed:.2f}s "
+          f"({total / elapsed:,.0f}/s)")
+    for name, value in get_db_pool_stats().items():
+        print(f"  {name:14s} {value}")
+
+
+if __name__ == "__main__":
+    main()
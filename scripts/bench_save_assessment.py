@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for save_assessment.
+
+Compares the single-transaction, upsert-based save_assessment with the
+original write path, which committed the organization, the user and the
+assessment separately and then updated the benchmark in a second session.
+Reports p50/p99 latency and the number of SQL statements per save.
+
+Run it against a scratch database; it writes --saves assessments per
+implementation. Write-behind batching is turned off so both
+implementations write the benchmark on the request path.
+
+Usage:
+    DATABASE_URL=... python scripts/bench_save_assessment.py [--saves 300] [--companies 20]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["BENCHMARK_WRITE_BEHIND"] = "0"
+
+from db.models import Assessment, Organization, User, get_db_engine, get_db_session, init_db
+from db.operations import (is_outlier_assessment, record_daily_aggregates, record_score_histograms,
+                           record_segment_aggregates, save_assessment, update_benchmark)
+from utils.scoring import QUESTION_IDS, compute_scores
+
+
+# ------------------------------------------
+# ORIGINAL IMPLEMENTATION (REFERENCE)
+# ------------------------------------------
+
+def legacy_save_assessment(company_name, scores_data, answers, user_name=None, user_email=None, segments=None):
+    segments = segments or {}
+    session = get_db_session()
+    try:
+        org = session.query(Organization).filter_by(name=company_name).first()
+        if not org:
+            org = Organization(name=company_name)
+            session.add(org)
+            session.commit()
+            session.refresh(org)
+
+        user_id = None
+        if user_name and user_email:
+            user = session.query(User).filter_by(email=user_email, organization_id=org.id).first()
+            if not user:
+                user = User(name=user_name, email=user_email, organization_id=org.id)
+                session.add(user)
+                session.commit()
+                session.refresh(user)
+            user_id = user.id
+
+        assessment = Assessment(
+            organization_id=org.id,
+            user_id=user_id,
+            company_name=company_name,
+            total_score=scores_data['total'],
+            percentage=scores_data['percentage'],
+            readiness_band=scores_data['readiness_band']['label'],
+            scoring_rules_version=scores_data['scoring_rules_version'],
+            variant_id=scores_data['variant_id'],
+            dimension_scores=[dict(dim_score) for dim_score in scores_data['dimension_scores']],
+            answers=answers,
+            ai_stage=segments.get('stage'),
+            company_size=segments.get('size'),
+            region=segments.get('region'),
+        )
+        raw_dimension_scores = [dim_score['score'] for dim_score in scores_data['dimension_scores']]
+        outlier = is_outlier_assessment(raw_dimension_scores)
+
+        session.add(assessment)
+        record_score_histograms(session, answers, assessment.variant_id)
+        if not outlier:
+            metric_values = {
+                dim_score['id']: float(dim_score['score'])
+                for dim_score in scores_data['dimension_scores']
+                if isinstance(dim_score, Mapping)
+            }
+            metric_values['total'] = float(scores_data['total'])
+            record_segment_aggregates(session, segments, metric_values)
+            record_daily_aggregates(session, datetime.utcnow().date(), metric_values)
+        session.commit()
+        session.refresh(assessment)
+
+        if not outlier:
+            update_benchmark(raw_dimension_scores)
+        return assessment
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+
+# ------------------------------------------
+# BENCHMARK
+# ------------------------------------------
+
+class StatementCounter:
+    """Counts statements executed on this thread's connections"""
+
+    def __init__(self, engine):
+        self.count = 0
+        self._thread = threading.get_ident()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        if threading.get_ident() == self._thread:
+            self.count += 1
+
+
+def make_submissions(count, companies, seed):
+    rng = random.Random(seed)
+    submissions = []
+    for i in range(count):
+        answers = {question_id: rng.randint(1, 5) for question_id in QUESTION_IDS}
+        company = rng.randrange(companies)
+        submissions.append((
+            f"Bench Company {seed}-{company}",
+            compute_scores(answers),
+            answers,
+            f"Bench User {i}",
+            f"bench-{seed}-{i}@example.com",
+            {"size": "50–500 employees", "region": "NY"},
+        ))
+    return submissions
+
+
+def run(save, submissions, counter):
+    latencies = []
+    statements = counter.count
+    for company, scores, answers, user_name, user_email, segments in submissions:
+        started = time.perf_counter()
+        save(company, scores, answers, user_name=user_name, user_email=user_email, segments=segments)
+        latencies.append(time.perf_counter() - started)
+    latencies = np.array(latencies) * 1000
+    return {
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+        "statements": (counter.count - statements) / len(submissions),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--saves", type=int, default=300)
+    parser.add_argument("--companies", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    counter = StatementCounter(get_db_engine())
+    seed = int(time.time())
+
+    # Warm up the pool, the scoring cache and the aggregate rows
+    run(save_assessment, make_submissions(20, args.companies, seed - 1), counter)
+
+    results = {
+        "original": run(legacy_save_assessment, make_submissions(args.saves, args.companies, seed), counter),
+        "single transaction": run(save_assessment, make_submissions(args.saves, args.companies, seed + 1), counter),
+    }
+
+    print(f"{args.saves:,} saves per implementation, {args.companies} companies")
+    print(f"{'':20s} {'p50 ms':>8s} {'p99 ms':>8s} {'statements':>11s}")
+    for name, result in results.items():
+        print(f"{name:20s} {result['p50']:8.2f} {result['p99']:8.2f} {result['statements']:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
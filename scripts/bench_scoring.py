@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for batch scoring.
+
+Scores synthetic answer matrices with compute_scores_batch, checks a sample
+of rows against compute_scores and prints rows/second for both paths.
+
+Usage:
+    python scripts/bench_scoring.py [--rows 1000000] [--sample 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.scoring import (QUESTION_IDS, batch_row_to_scores, compute_scores,
+                           compute_scores_batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    matrix = rng.integers(1, 6, size=(args.rows, len(QUESTION_IDS))).astype(np.float64)
+
+    start = time.perf_counter()
+    batch = compute_scores_batch(matrix)
+    batch_elapsed = time.perf_counter() - start
+
+    sample = min(args.sample, args.rows)
+    sample_answers = [
+        dict(zip(QUESTION_IDS, (int(value) for value in row)))
+        for row in matrix[:sample]
+    ]
+
+    start = time.perf_counter()
+    scalar_results = [compute_scores(answers) for answers in sample_answers]
+    scalar_elapsed = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for row, expected in enumerate(scalar_results)
+        if batch_row_to_scores(batch, row) != expected
+    )
+
+    print(f"Batch:  {args.rows:,} rows in {batch_elapsed:.3f}s "
+          f"({args.rows / batch_elapsed:,.0f} rows/s)")
+    print(f"Scalar: {sample:,} rows in {scalar_elapsed:.3f}s "
+          f"({sample / scalar_elapsed:,.0f} rows/s)")
+    print(f"Speed-up: {(args.rows / batch_elapsed) / (sample / scalar_elapsed):,.1f}x")
+    print(f"Mismatches against compute_scores: {mismatches}/{sample:,}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
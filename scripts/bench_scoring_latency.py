@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Per-call latency micro-benchmark for compute_scores.
+
+Compares the compiled scoring plan, with and without the compute_scores
+memo cache, against the original implementation, which walked DIMENSIONS
+and rebuilt the band and critical-status dicts on every call.
+
+Usage:
+    python scripts/bench_scoring_latency.py [--calls 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.dimensions import DIMENSIONS
+from utils.score_cache import thaw_scores
+from utils.scoring import QUESTION_IDS, SCORING_PLAN, compute_scores
+
+
+# ------------------------------------------
+# ORIGINAL IMPLEMENTATION (REFERENCE)
+# ------------------------------------------
+
+def legacy_compute_scores(answers):
+    raw_dimension_scores = []
+    for dimension in DIMENSIONS:
+        dim_total = sum(
+            float(answers.get(question["id"], 0))
+            for question in dimension["questions"]
+        )
+        raw_dimension_scores.append(round(dim_total, 1))
+
+    total_score = sum(raw_dimension_scores)
+    max_possible = len(DIMENSIONS) * 15
+    percentage = round((total_score / max_possible) * 100) if max_possible else 0
+
+    if percentage >= 75:
+        readiness_band = {"label": "🟢 AI-Ready", "color": "#10B981",
+                          "description": "Strong governance and operational foundation."}
+    elif percentage >= 60:
+        readiness_band = {"label": "🔵 Conditional Readiness", "color": "#3B82F6",
+                          "description": "AI may proceed cautiously with remediation."}
+    elif percentage >= 45:
+        readiness_band = {"label": "🟡 Foundational Exposure", "color": "#F59E0B",
+                          "description": "Significant structural gaps present."}
+    else:
+        readiness_band = {"label": "🔴 High Risk – Not Ready", "color": "#DC2626",
+                          "description": "Core governance controls insufficient."}
+
+    governance, leadership, data = raw_dimension_scores[:3]
+    failed = []
+    if governance < 9:
+        failed.append(f"Governance ({governance}/15)")
+    if leadership < 9:
+        failed.append(f"Executive Leadership ({leadership}/15)")
+    if data < 9:
+        failed.append(f"Data Foundations ({data}/15)")
+
+    if len(failed) >= 2:
+        critical_status = {"severity": "critical", "icon": "🛑",
+                           "title": "Critical Threshold Breach",
+                           "message": ", ".join(failed) + " are below minimum threshold (9.0)."}
+    elif len(failed) == 1:
+        critical_status = {"severity": "warning", "icon": "⚠️",
+                           "title": "Critical Threshold Warning",
+                           "message": failed[0] + " is below minimum threshold (9.0)."}
+    else:
+        critical_status = {"severity": "info", "icon": "✓",
+                           "title": "All Critical Thresholds Met",
+                           "message": "Governance, Leadership, and Data meet minimum threshold."}
+
+    governance_index = round((raw_dimension_scores[0] / 15) * 100)
+
+    if critical_status["severity"] in ["critical", "warning"]:
+        if readiness_band["label"] == "🟢 AI-Ready":
+            readiness_band = {"label": "🔵 Conditional Readiness", "color": "#3B82F6",
+                              "description": "AI scaling restricted due to critical threshold breach."}
+
+    return {
+        "raw_dimension_scores": raw_dimension_scores,
+        "total": total_score,
+        "percentage": percentage,
+        "readiness_band": readiness_band,
+        "critical_status": critical_status,
+        "governance_index": governance_index
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    samples = [
+        {question_id: rng.randint(1, 5) for question_id in QUESTION_IDS}
+        for _ in range(1_000)
+    ]
+
+    mismatches = 0
+    for answers in samples:
+        expected = legacy_compute_scores(answers)
+        actual = thaw_scores(compute_scores(answers))
+        if any(actual[key] != value for key, value in expected.items()):
+            mismatches += 1
+
+    benchmarks = (
+        ("legacy", legacy_compute_scores),
+        ("compiled", SCORING_PLAN.score),
+        ("cached", compute_scores),
+    )
+    for name, function in benchmarks:
+        iterator = iter(samples * (args.calls // len(samples) + 1))
+        elapsed = timeit.timeit(lambda: function(next(iterator)), number=args.calls)
+        print(f"{name:>8}: {elapsed / args.calls * 1e6:.2f} µs/call")
+
+    print(f"Mismatches against the original implementation: {mismatches}/{len(samples)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
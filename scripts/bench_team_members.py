@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Query-count and latency benchmark for get_team_members.
+
+Seeds one organization with --users members and --assessments assessments
+each in a scratch database, then compares the set-based get_team_members
+(one query with window functions) against the original implementation,
+which loaded every assessment and queried the user for each one. Both must
+return the same members.
+
+Usage:
+    python scripts/bench_team_members.py [--database-url URL] [--users 200] [--assessments 10]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+
+COMPANY = "Team Bench Co"
+
+
+# ------------------------------------------
+# ORIGINAL IMPLEMENTATION (REFERENCE)
+# ------------------------------------------
+
+def legacy_get_team_members(company_name):
+    from db.models import Assessment, Organization, User, get_db_session
+
+    session = get_db_session()
+    try:
+        org = session.query(Organization).filter_by(name=company_name).first()
+        if not org:
+            return []
+
+        assessments = session.query(Assessment).filter_by(organization_id=org.id).all()
+        user_map = {}
+        for assessment in assessments:
+            if assessment.user_id:
+                user = session.query(User).filter_by(id=assessment.user_id).first()
+                if user:
+                    if user.id not in user_map:
+                        user_map[user.id] = {
+                            'id': user.id,
+                            'name': user.name,
+                            'email': user.email,
+                            'assessments': [],
+                        }
+                    user_map[user.id]['assessments'].append({
+                        'score': assessment.total_score,
+                        'percentage': assessment.percentage,
+                        'date': assessment.completed_at
+                    })
+
+        team_members = []
+        for user_data in user_map.values():
+            latest = max(user_data['assessments'], key=lambda x: x['date'])
+            user_data['latest_score'] = latest['score']
+            user_data['latest_percentage'] = latest['percentage']
+            user_data['latest_date'] = latest['date'].strftime('%Y-%m-%d %H:%M')
+            user_data['total_assessments'] = len(user_data['assessments'])
+            del user_data['assessments']
+            team_members.append(user_data)
+
+        return sorted(team_members, key=lambda x: x['latest_date'], reverse=True)
+    finally:
+        session.close()
+
+
+# ------------------------------------------
+# BENCHMARK
+# ------------------------------------------
+
+def seed(engine, users, assessments_per_user):
+    from db.models import Assessment, Organization, User
+
+    with engine.begin() as connection:
+        if connection.execute(text("SELECT COUNT(*) FROM organizations WHERE name = :name"), {"name": COMPANY}).scalar():
+            return
+        rng = random.Random(0)
+        now = datetime.utcnow()
+        org_id = connection.execute(Organization.__table__.insert().values(name=COMPANY)).inserted_primary_key[0]
+        user_ids = [
+            connection.execute(User.__table__.insert().values(
+                name=f"Member {i}", email=f"team-bench-{i}@example.com", organization_id=org_id
+            )).inserted_primary_key[0]
+            for i in range(users)
+        ]
+        connection.execute(Assessment.__table__.insert(), [
+            {
+                "organization_id": org_id,
+                "user_id": user_id,
+                "company_name": COMPANY,
+                "total_score": rng.randint(18, 90),
+                "percentage": rng.randint(20, 100),
+                "readiness_band": "Developing",
+                "dimension_scores": [],
+                "answers": {},
+                # Distinct minutes so both implementations agree on the latest
+                "completed_at": now - timedelta(minutes=index * users + position),
+            }
+            for position, user_id in enumerate(user_ids)
+            for index in range(assessments_per_user)
+        ])
+
+
+def measure(engine, call, repeats):
+    statements = 0
+    thread = threading.get_ident()
+
+    def on_execute(*args):
+        nonlocal statements
+        if threading.get_ident() == thread:
+            statements += 1
+
+    latencies = []
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = call(COMPANY)
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return result, statements / repeats, statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", help="scratch database (default: temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--assessments", type=int, default=10, help="assessments per user")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    scratch = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch.name}"
+
+    from db.models import dispose_db_engine, init_db
+    from db.operations import get_team_members
+
+    try:
+        engine = init_db()
+        seed(engine, args.users, args.assessments)
+
+        legacy, legacy_statements, legacy_ms = measure(engine, legacy_get_team_members, args.repeats)
+        current, current_statements, current_ms = measure(engine, get_team_members, args.repeats)
+        if current != legacy:
+            raise SystemExit("get_team_members differs from the original implementation")
+
+        print(f"{len(current)} members, {args.users * args.assessments:,} assessments")
+        print(f"{'':12s} {'queries':>8s} {'median ms':>10s}")
+        print(f"{'original':12s} {legacy_statements:8.0f} {legacy_ms:10.2f}")
+        print(f"{'set-based':12s} {current_statements:8.0f} {current_ms:10.2f}")
+    finally:
+        dispose_db_engine()
+        if scratch is not None:
+            os.unlink(scratch.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the hot organization queries.
+
+Seeds a scratch database, runs get_latest_assessment, get_team_statistics
+and get_organization_assessments while capturing every SQL statement they
+issue, and EXPLAINs each one. Exits with status 1 if any statement falls
+back to a sequential (full table) scan, i.e. an index from
+db/migrations.py is missing or no longer usable.
+
+By default a temporary SQLite database is used. To check PostgreSQL, pass
+--database-url pointing at a scratch database; sequential scans are
+disabled for the EXPLAIN so small tables do not hide a missing index.
+
+Usage:
+    python scripts/check_query_plans.py [--database-url URL] [--organizations 200] [--assessments 20]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+
+
+def seed(engine, organizations, assessments_per_organization):
+    """Bulk-insert organizations, users and assessments unless already seeded"""
+    from db.models import Assessment, Organization, User
+
+    with engine.begin() as connection:
+        if connection.execute(text("SELECT COUNT(*) FROM organizations WHERE name LIKE 'Plan Check %'")).scalar():
+            return
+        rng = random.Random(0)
+        now = datetime.utcnow()
+        org_ids = [
+            connection.execute(Organization.__table__.insert().values(name=f"Plan Check {i}")).inserted_primary_key[0]
+            for i in range(organizations)
+        ]
+        connection.execute(User.__table__.insert(), [
+            {"name": f"User {org_id}", "email": f"plan-check-{org_id}@example.com", "organization_id": org_id}
+            for org_id in org_ids
+        ])
+        connection.execute(Assessment.__table__.insert(), [
+            {
+                "organization_id": org_id,
+                "company_name": f"Plan Check {org_id}",
+                "total_score": rng.randint(18, 90),
+                "percentage": rng.randint(20, 100),
+                "readiness_band": "Developing",
+                "dimension_scores": [],
+                "answers": {},
+                "completed_at": now - timedelta(days=rng.randint(0, 365)),
+            }
+            for org_id in org_ids
+            for _ in range(assessments_per_organization)
+        ])
+        if engine.dialect.name in ("postgresql", "sqlite"):
+            connection.execute(text("ANALYZE"))
+
+
+def capture_statements(engine, call):
+    """Run call() and return the (statement, parameters) it executed on this thread"""
+    statements = []
+    thread = threading.get_ident()
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return statements
+
+
+def explain(engine, statement, parameters):
+    """(plan lines, sequential scan lines) for one statement"""
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET enable_seqscan = off")
+            lines = [row[0] for row in connection.exec_driver_sql("EXPLAIN " + statement, parameters)]
+            return lines, [line for line in lines if "Seq Scan" in line]
+
+        if engine.dialect.name == "sqlite":
+            lines = [row[-1] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+            return lines, [
+                line for line in lines
+                if line.startswith("SCAN ") and "USING" not in line
+            ]
+
+        raise SystemExit(f"Query plan check does not support {engine.dialect.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", help="scratch database (default: temporary SQLite file)")
+    parser.add_argument("--organizations", type=int, default=200)
+    parser.add_argument("--assessments", type=int, default=20, help="assessments per organization")
+    args = parser.parse_args()
+
+    scratch = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch.name}"
+
+    from db.models import dispose_db_engine, init_db
+    from db.operations import get_latest_assessment, get_organization_assessments, get_team_statistics
+
+    try:
+        engine = init_db()
+        seed(engine, args.organizations, args.assessments)
+
+        company = f"Plan Check {args.organizations // 2}"
+        queries = {
+            "get_latest_assessment": lambda: get_latest_assessment(company),
+            "get_team_statistics": lambda: get_team_statistics(company),
+            "get_organization_assessments": lambda: get_organization_assessments(company),
+        }
+
+        failures = 0
+        for name, call in queries.items():
+            print(name)
+            for statement, parameters in capture_statements(engine, call):
+                lines, scans = explain(engine, statement, parameters)
+                status = "SEQUENTIAL SCAN" if scans else "ok"
+                print(f"  [{status}] {' '.join(statement.split())[:100]}")
+                for line in lines:
+                    print(f"      {line}")
+                failures += bool(scans)
+
+        print(f"{failures} statement(s) with sequential scans")
+        sys.exit(1 if failures else 0)
+    finally:
+        dispose_db_engine()
+        if scratch is not None:
+            os.unlink(scratch.name)
+
+
+if __name__ == "__main__":
+    main()
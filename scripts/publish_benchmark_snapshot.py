@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Publish a new immutable benchmark snapshot, e.g. from a scheduled job
+right after rebuild_benchmark.py.
+
+New results compare against the latest snapshot; stored results and their
+reports keep the snapshot id they were compared against. The app also
+publishes one on demand when the latest is older than
+BENCHMARK_SNAPSHOT_MAX_AGE seconds.
+
+Usage:
+    DATABASE_URL=... python scripts/publish_benchmark_snapshot.py [--show]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.benchmarks import publish_benchmark_snapshot
+from db.models import init_db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--show", action="store_true",
+                        help="print the total of every benchmark in the snapshot")
+    args = parser.parse_args()
+
+    init_db()
+    snapshot = publish_benchmark_snapshot()
+    print(f"Published benchmark snapshot #{snapshot['id']} "
+          f"with {len(snapshot['benchmarks'])} benchmarks")
+
+    if args.show:
+        for name, benchmark in snapshot['benchmarks'].items():
+            print(f"  {name:45s} {benchmark['total']:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
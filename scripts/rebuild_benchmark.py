@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Rebuild the moving-average benchmark exactly from stored assessments, or
+check how far the stored benchmark has drifted.
+
+The exact benchmark is one SQL aggregate over assessments; nothing is
+loaded row by row. With --check the benchmark is left untouched and the
+exit status is 1 when the drift exceeds --tolerance.
+
+The rebuild locks the benchmark accumulators and computes and writes the
+exact sums in one transaction. Write-behind contributions buffered in the
+app processes are not visible to it and are added on top when they flush,
+so run it while the app is idle (or with BENCHMARK_WRITE_BEHIND=0 set for
+the app) and confirm with --check afterwards.
+
+Usage:
+    DATABASE_URL=... python scripts/rebuild_benchmark.py [--check] [--tolerance 0.05]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.benchmark_rebuild import DEFAULT_DRIFT_TOLERANCE, check_benchmark_drift, rebuild_benchmark
+from db.models import init_db
+
+
+def print_drift(report):
+    print(f"Stored: {report['stored_count']:,} assessments, exact: {report['exact_count']:,}")
+    for stored, exact, drift in zip(report['stored_scores'], report['exact_scores'], report['drift']):
+        print(f"  stored {stored:8.4f}  exact {exact:8.4f}  drift {drift:.4f}")
+    print(f"Max drift: {report['max_drift']:.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--check", action="store_true",
+                        help="only compare the stored benchmark with the exact one")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_DRIFT_TOLERANCE)
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    report = check_benchmark_drift(args.tolerance)
+    print_drift(report)
+
+    if args.check:
+        print(f"Checked in {time.perf_counter() - started:.2f}s")
+        sys.exit(0 if report['within_tolerance'] else 1)
+
+    exact = rebuild_benchmark()
+    if exact is None:
+        print("No assessments; benchmark left unchanged")
+    else:
+        print(f"Rebuilt from {exact['assessment_count']:,} assessments "
+              f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Rescore stored assessments, e.g. after a fix to the scoring code.
+
+By default each assessment is rescored with the scoring rules version
+stamped on it, so stored results stay reproducible; pass --rules-version
+(e.g. the current version) to move every base-questionnaire assessment to
+that version. Progress is checkpointed after every chunk; re-running the
+command after an interruption resumes where it stopped.
+
+Usage:
+    DATABASE_URL=... python scripts/rescore_assessments.py [--chunk-size 5000] [--restart]
+                                                           [--rules-version N]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.models import init_db
+from db.rescoring import DEFAULT_JOB_NAME, rescore_assessments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--job-name", default=DEFAULT_JOB_NAME)
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore the checkpoint and start from the first row")
+    parser.add_argument("--rules-version", type=int, default=None,
+                        help="rescore every assessment with this scoring rules version")
+    args = parser.parse_args()
+
+    init_db()
+    summary = rescore_assessments(
+        chunk_size=args.chunk_size,
+        job_name=args.job_name,
+        restart=args.restart,
+        rules_version=args.rules_version,
+        progress=lambda s: print(f"  up to id {s['last_id']}: "
+                                 f"{s['processed']:,} scored, {s['updated']:,} updated"),
+    )
+    print(f"Done: {summary['processed']:,} scored, {summary['updated']:,} updated")
+
+
+if __name__ == "__main__":
+    main()
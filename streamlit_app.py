@@ -8,9 +8,15 @@ from io import BytesIO
 from PIL import Image
 from utils.recommendations import generate_dimension_recommendations
 from utils.scoring import compute_scores
-from data.dimensions import DIMENSIONS
+from utils.running_score import RunningScore
+from utils.sensitivity import analyze_sensitivity
+from utils.percentiles import get_percentile_engine, ordinal
+from utils.variants import get_variant
 from utils.html_report_generator import generate_html_report
-from data.benchmarks import get_benchmark_comparison, get_all_benchmarks, get_benchmark_data
+from data.benchmarks import (get_benchmark_comparison_matrix, comparison_from_matrix,
+                             get_benchmark_snapshot)
+from utils.benchmark_cache import BENCHMARK_CACHE
+from data.segments import AI_STAGE_OPTIONS, COMPANY_SIZE_OPTIONS, assessment_segments
 from db.operations import (ensure_tables_exist, save_assessment)
 from sendgrid_sender import send_assistance_request_email, send_feedback_email
 # Use SendGrid for report delivery
@@ -249,14 +255,28 @@ def initialize_session_state():
     if 'db_initialized' not in st.session_state:
         st.session_state.db_initialized = ensure_tables_exist()
 
+    if 'variant_id' not in st.session_state:
+        # Industry questionnaire variant, selected with ?variant=<id>
+        variant_id = st.query_params.get("variant")
+        try:
+            st.session_state.variant_id = get_variant(variant_id).id
+        except (KeyError, ValueError) as e:
+            print(f"Questionnaire variant error: {e}")
+            st.session_state.variant_id = get_variant().id
     if 'answers' not in st.session_state:
         st.session_state.answers = {}
+    if 'running_score' not in st.session_state:
+        st.session_state.running_score = RunningScore.from_answers(
+            st.session_state.answers, get_active_variant().plan
+        )
     if 'current_dimension' not in st.session_state:
         st.session_state.current_dimension = 0
     if 'assessment_complete' not in st.session_state:
         st.session_state.assessment_complete = False
     if 'current_assessment_id' not in st.session_state:
         st.session_state.current_assessment_id = None
+    if 'benchmark_snapshot_id' not in st.session_state:
+        st.session_state.benchmark_snapshot_id = None
     if 'company_logo' not in st.session_state:
         # Load default T-Logic logo
         try:
@@ -280,6 +300,8 @@ def initialize_session_state():
         st.session_state.user_phone = ""
     if 'user_location' not in st.session_state:
         st.session_state.user_location = ""
+    if 'user_company_size' not in st.session_state:
+        st.session_state.user_company_size = None
     if 'user_info_collected' not in st.session_state:
         st.session_state.user_info_collected = False
     if 'should_scroll_to_top' not in st.session_state:
@@ -302,6 +324,28 @@ def initialize_session_state():
         st.session_state.show_stage_modal = False
 
 
+def get_active_variant():
+    """Compiled questionnaire variant for this session"""
+    return get_variant(st.session_state.variant_id)
+
+
+def get_active_dimensions():
+    """The active variant's dimensions as DIMENSIONS-style dicts (its own question ids)"""
+    return get_active_variant().questionnaire.as_dicts()
+
+
+def set_answer(question_id, value):
+    """Record an answer and keep the running score in step"""
+    st.session_state.answers[question_id] = value
+    st.session_state.running_score.set(question_id, value)
+
+
+def reset_answers():
+    """Clear all answers and the running score"""
+    st.session_state.answers = {}
+    st.session_state.running_score = RunningScore(get_active_variant().plan)
+
+
 def render_header():
     """Render the main header with logo and branding"""
     col1, col2 = st.columns([4, 1])
@@ -407,7 +451,8 @@ with st.container():
 def render_progress_bar():
     """Render progress bar with arrow indicators - Sticky header"""
     current_dim = st.session_state.current_dimension
-    dimension = DIMENSIONS[current_dim]
+    dimensions = get_active_dimensions()
+    dimension = dimensions[current_dim]
     dimension_color = dimension['color']
     bright_color = dimension['color']
 
@@ -418,13 +463,13 @@ def render_progress_bar():
     # Build arrows HTML with fixed width and text wrapping
     arrows_html = f'<div id="progress-anchor" data-render="{timestamp}" style="display: flex; align-items: center; margin-bottom: 0.5rem; gap: 0; max-width: 100%;">'
 
-    for i, dim in enumerate(DIMENSIONS):
+    for i, dim in enumerate(dimensions):
         # Determine if this arrow should be lit up
         is_active = i <= current_dim
         arrow_color = dim['color'] if is_active else '#374151'
         text_color = '#000000' if is_active else '#6B7280'
         margin_left = '-15px' if i > 0 else '0'
-        z_index = len(DIMENSIONS) - i
+        z_index = len(dimensions) - i
 
         # Fixed width arrows with text wrapping - single line to avoid rendering issues
         arrow_html = f'<div style="position: relative; background-color: {arrow_color}; height: 60px; width: 120px; min-width: 100px; display: flex; align-items: center; justify-content: center; clip-path: polygon(0 0, calc(100% - 15px) 0, 100% 50%, calc(100% - 15px) 100%, 0 100%, 15px 50%); margin-left: {margin_left}; z-index: {z_index};"><span style="color: {text_color}; font-size: 0.75rem; font-weight: 600; text-align: center; padding: 0 8px; line-height: 1.1; word-wrap: break-word; overflow-wrap: break-word; max-width: 104px;">{dim["title"]}</span></div>'
@@ -484,7 +529,7 @@ def render_progress_bar():
                     <span style="color: #D1D5DB; font-size: 1.05rem; font-style: italic;"> - {dimension["description"]}</span>
                 </div>
                 <div class="dimension-label">
-                    <span style="color: {dimension_color}; font-size: 1.1rem; font-weight: 600;">Dimension {current_dim + 1} of {len(DIMENSIONS)}</span>
+                    <span style="color: {dimension_color}; font-size: 1.1rem; font-weight: 600;">Dimension {current_dim + 1} of {len(dimensions)}</span>
                 </div>
             </div>
         </div>
@@ -497,7 +542,7 @@ def render_dimension_questions(dimension_idx):
     """Render questions for a specific dimension"""
     ()
     
-    dimension = DIMENSIONS[dimension_idx]
+    dimension = get_active_variant().questionnaire.dimensions[dimension_idx]
 
     # --- Dimension page helper: ALWAYS scroll to top when entering dimension page ---
     components.html("""
@@ -601,50 +646,41 @@ def render_dimension_questions(dimension_idx):
 
     def on_answer_change(question_id, question_idx):
         """Callback when a question is answered"""
+        set_answer(question_id, st.session_state[f"q_{question_id}"])
+
         # Only trigger scroll if not the last question
-        if question_idx < len(dimension['questions']) - 1:
+        if question_idx < len(dimension.questions) - 1:
             st.session_state.scroll_to_question = question_idx + 1
 
     # Initialize all questions with default middle answer (3) if not already answered
-    for question in dimension['questions']:
-        if question['id'] not in st.session_state.answers:
-            st.session_state.answers[question['id']] = 3
+    for question in dimension.questions:
+        if question.id not in st.session_state.answers:
+            set_answer(question.id, 3)
 
-    for i, question in enumerate(dimension['questions']):
-        question_id = f"q_{question['id']}"
+    for i, question in enumerate(dimension.questions):
+        question_id = f"q_{question.id}"
 
         # Create unique anchor for each question
         st.markdown(
-            f'<div id="question-{i}" style="color: {dimension["color"]}; margin-bottom: -0.3rem;">{i+1}. {question["text"]}</div>',
+            f'<div id="question-{i}" style="color: {dimension.color}; margin-bottom: -0.3rem;">{i+1}. {question.text}</div>',
             unsafe_allow_html=True)
 
         # Get current answer or default
-        current_answer = st.session_state.answers.get(question['id'], 3)
-
-        # Use question-specific answer choices if available, otherwise use dimension scoring labels
-        answer_choices = question.get(
-            'answer_choices',
-            dimension.get('scoring_labels', {
-                1: "1",
-                2: "2",
-                3: "3",
-                4: "4",
-                5: "5"
-            }))
+        current_answer = st.session_state.answers.get(question.id, 3)
 
         # Create rating scale with question-specific labels with on_change callback
         rating = st.radio(
             "Rating",
-            options=[1, 2, 3, 4, 5],
-            format_func=lambda x: f"{x} - {answer_choices[x]}",
+            options=question.radio_options,
+            format_func=question.radio_labels.__getitem__,
             key=question_id,
-            index=current_answer - 1,  # Convert to 0-indexed
+            index=question.radio_options.index(current_answer),
             horizontal=False,
             on_change=on_answer_change,
-            args=(question['id'], i),
+            args=(question.id, i),
             label_visibility="collapsed")
 
-        st.session_state.answers[question['id']] = rating
+        set_answer(question.id, rating)
         st.markdown('<div style="margin: -0.4rem 0 -0.3rem 0;"><hr style="margin: 0.15rem 0;"></hr></div>', unsafe_allow_html=True)
 
     # Execute auto-scroll script only if scroll is triggered for a specific question
@@ -724,12 +760,12 @@ def render_navigation_buttons():
                     del st.session_state[key]
 
             st.session_state.current_dimension = 0
-            st.session_state.answers = {}
+            reset_answers()
             st.session_state.mode = "assessment"
             st.rerun()
 
     with col3:
-        if st.session_state.current_dimension < len(DIMENSIONS) - 1:
+        if st.session_state.current_dimension < len(get_active_dimensions()) - 1:
             if st.button("Next →", type="primary"):
                 st.session_state.current_dimension += 1
                 st.session_state.scroll_to_question = None
@@ -738,10 +774,15 @@ def render_navigation_buttons():
         else:
             if st.button("Complete Assessment", type="primary"):
                 st.session_state["scores_data"] = compute_scores(
-                    st.session_state.answers
+                    st.session_state.answers,
+                    variant_id=st.session_state.variant_id
                 )
                 st.session_state["mode"] = "results"
 
+                # Results, charts and reports compare against this snapshot
+                snapshot = get_benchmark_snapshot()
+                st.session_state.benchmark_snapshot_id = snapshot["id"] if snapshot else None
+
                 try:
                     assessment = save_assessment(
                         company_name=st.session_state.company_name,
@@ -750,6 +791,12 @@ def render_navigation_buttons():
                         primary_color=st.session_state.primary_color,
                         user_name=st.session_state.user_name or "",
                         user_email=st.session_state.user_email or "",
+                        segments=assessment_segments(
+                            ai_stage=st.session_state.ai_implementation_stage,
+                            company_size=st.session_state.user_company_size,
+                            location=st.session_state.user_location,
+                        ),
+                        benchmark_snapshot_id=st.session_state.benchmark_snapshot_id,
                     )
                     st.session_state.current_assessment_id = assessment.id
                 except Exception as e:
@@ -961,12 +1008,20 @@ def render_results_dashboard(scores_data):
 
     primary_color = st.session_state.primary_color
 
+    percentile_engine = get_percentile_engine(variant_id=st.session_state.variant_id)
+    total_percentile = percentile_engine.percentile(scores_data["total"]) if percentile_engine else None
+    percentile_html = (
+        f'<div style="font-size: 0.95rem; color: #9CA3AF;">{ordinal(total_percentile)} percentile of all assessments</div>'
+        if total_percentile is not None else ""
+    )
+
     with col1:
         st.markdown(f"""
         <div class="score-card">
             <h3 style="color: {primary_color};">Total Score</h3>
             <div style="font-size: 2rem; font-weight: bold;">{total_score}/90</div>
             <div style="font-size: 2rem; font-weight: bold; color: #E07A5F;">({percentage}%)</div>
+            {percentile_html}
         </div>
         """,
                     unsafe_allow_html=True)
@@ -1109,6 +1164,35 @@ def render_results_dashboard(scores_data):
     </div>
     """, unsafe_allow_html=True)
 
+    # Fastest path to the next readiness band
+    sensitivity = analyze_sensitivity(st.session_state.answers, get_active_variant().plan)
+    if sensitivity["next_band"] is not None:
+        st.markdown(
+            f'<h3 style="color: {primary_color}; text-align: center; margin-bottom: 1rem;">🚀 Fastest Path to {sensitivity["next_band"]["label"]}</h3>',
+            unsafe_allow_html=True)
+
+        if sensitivity["minimum_changes_to_next_band"]:
+            for option in sensitivity["minimum_changes_to_next_band"][:3]:
+                changes_text = " and ".join(
+                    f"**{change['dimension']}** – {change['question']} "
+                    f"({change['from']} → {change['to']}: {change['to_label']})"
+                    for change in option["changes"]
+                )
+                st.markdown(f"- {changes_text} → {option['percentage']}%")
+        else:
+            st.info("Reaching the next readiness band requires improvements across more than two answers.")
+
+        critical_fixes = [
+            option for option in sensitivity["single_changes"] if option["clears_critical"]
+        ]
+        if critical_fixes:
+            option = critical_fixes[0]
+            change = option["changes"][0]
+            st.caption(
+                f"Quickest critical-threshold fix: {change['dimension']} – {change['question']} "
+                f"({change['from']} → {change['to']})"
+            )
+
     # Add "See Recommended Actions" button at bottom center of Scoring Model
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
@@ -1126,8 +1210,9 @@ def render_results_dashboard(scores_data):
     # Dimension Breakdown Chart (Spider/Radar)
     st.markdown(f'<h3 style="font-size: 18px; color: {primary_color}; font-weight: bold;">Dimension Breakdown</h3>', unsafe_allow_html=True)
     raw_scores_list = scores_data['raw_dimension_scores']
-    dimension_titles = [d['title'] for d in DIMENSIONS]
-    dimension_colors = [d['color'] for d in DIMENSIONS]
+    dimensions = get_active_dimensions()
+    dimension_titles = [d['title'] for d in dimensions]
+    dimension_colors = [d['color'] for d in dimensions]
     fig = create_dimension_breakdown_chart(raw_scores_list, dimension_titles, dimension_colors)
     st.plotly_chart(fig, use_container_width=True)
 
@@ -1139,21 +1224,38 @@ def render_results_dashboard(scores_data):
         # Benchmark selector
         col1, col2 = st.columns([2, 3])
 
+        # Compare against every benchmark once; switching the selectbox
+        # only picks a row. Snapshots are immutable, so the matrix only
+        # changes with the assessment or snapshot (live benchmarks, used
+        # when no snapshot is available, key on the cache version instead)
+        snapshot_id = st.session_state.get("benchmark_snapshot_id")
+        snapshot = get_benchmark_snapshot(snapshot_id) if snapshot_id is not None else None
+        matrix_key = (st.session_state.current_assessment_id, scores_data["total"],
+                      tuple(scores_data["raw_dimension_scores"]),
+                      snapshot["id"] if snapshot else ("live", BENCHMARK_CACHE.version))
+        if st.session_state.get("benchmark_matrix_key") != matrix_key:
+            st.session_state.benchmark_matrix = get_benchmark_comparison_matrix(
+                scores_data, snapshot=snapshot
+            )
+            st.session_state.benchmark_matrix_key = matrix_key
+        benchmark_matrix = st.session_state.benchmark_matrix
+        all_benchmarks = benchmark_matrix["benchmark_names"]
+
         with col1:
-            all_benchmarks = get_all_benchmarks()
             default_idx = all_benchmarks.index(
                 'Moving Average Benchmark') if 'Moving Average Benchmark' in all_benchmarks else 0
             benchmark_name = st.selectbox("Compare against:",
                                           options=all_benchmarks,
                                           index=default_idx)
 
+        benchmark_row = all_benchmarks.index(benchmark_name)
         with col2:
-            benchmark_info = get_benchmark_data(benchmark_name)
-            st.info(benchmark_info['description'])
+            st.info(benchmark_matrix["benchmark_descriptions"][benchmark_row])
+            if benchmark_matrix["snapshot_id"] is not None:
+                st.caption(f"Benchmark snapshot #{benchmark_matrix['snapshot_id']}")
 
         # Get comparison data
-        from data.benchmarks import get_benchmark_comparison as get_comp
-        comparison = get_comp(scores_data, benchmark_name)
+        comparison = comparison_from_matrix(benchmark_matrix, benchmark_row)
 
         # Comparison summary
         col1, col2, col3 = st.columns(3)
@@ -1257,6 +1359,22 @@ def render_results_dashboard(scores_data):
 
         df_comparison = pd.DataFrame(comparison_data)
         st.dataframe(df_comparison, use_container_width=True, hide_index=True)
+
+        # Every benchmark side by side
+        with st.expander("📊 All Benchmarks"):
+            label_icons = ('🔴', '🟡', '🟢')
+            all_rows = []
+            for row, name in enumerate(all_benchmarks):
+                table_row = {
+                    'Benchmark': name,
+                    'Benchmark Total': f"{benchmark_matrix['benchmark_totals'][row]:.1f}/90",
+                    'Difference': f"{benchmark_matrix['total_differences'][row]:+.1f}",
+                }
+                for col, title in enumerate(benchmark_matrix['dimension_titles']):
+                    code = benchmark_matrix['label_codes'][row, col]
+                    table_row[title] = f"{label_icons[code]} {benchmark_matrix['differences'][row, col]:+.1f}"
+                all_rows.append(table_row)
+            st.dataframe(pd.DataFrame(all_rows), use_container_width=True, hide_index=True)
     except Exception as e:
         st.error(f"Unable to load benchmark comparison: {str(e)}")
 
@@ -1292,7 +1410,8 @@ def render_results_dashboard(scores_data):
 
     dimension_recommendations = generate_dimension_recommendations(scores_data)
 
-    for dimension in DIMENSIONS:
+    # The variant's own question ids key the answers
+    for dimension in get_active_dimensions():
 
         rec_item = next(
             r for r in dimension_recommendations
@@ -1513,7 +1632,7 @@ def render_results_dashboard(scores_data):
 
     with col1:
         if st.button("🔄 Retake Assessment", type="primary", use_container_width=True, key="retake_assessment_bottom"):
-            st.session_state.answers = {}
+            reset_answers()
             st.session_state.current_dimension = 0
             st.session_state.assessment_complete = False
             st.session_state.user_info_collected = False
@@ -1584,7 +1703,8 @@ def render_results_dashboard(scores_data):
                             scores_data,
                             company_name=st.session_state.user_company or "Your Organization",
                             company_logo_b64=logo_b64,
-                            primary_color=st.session_state.primary_color
+                            primary_color=st.session_state.primary_color,
+                            benchmark_snapshot_id=st.session_state.get("benchmark_snapshot_id")
                         )
                         
                         # Send email with report using SendGrid
@@ -1865,6 +1985,13 @@ def main():
                     value=st.session_state.user_location,
                     placeholder="e.g., New York, NY")
 
+            user_company_size = st.selectbox(
+                "Company Size",
+                options=COMPANY_SIZE_OPTIONS,
+                index=(COMPANY_SIZE_OPTIONS.index(st.session_state.user_company_size)
+                       if st.session_state.user_company_size in COMPANY_SIZE_OPTIONS else None),
+                placeholder="Select company size (optional)")
+
             # Apply white text styling to Continue button
             components.html("""
                 <script>
@@ -1893,6 +2020,7 @@ def main():
                 st.session_state.user_company = user_company
                 st.session_state.user_phone = user_phone
                 st.session_state.user_location = user_location
+                st.session_state.user_company_size = user_company_size
 
                 # User info collected - proceed to assessment
                 # (Email will be sent when they complete and request report)
@@ -1939,13 +2067,7 @@ def main():
                 st.markdown("<h2 style='text-align: center; color: #BF6A16; margin-bottom: 2rem;'>Before we start...</h2>", unsafe_allow_html=True)
                 st.markdown("<p style='text-align: center; font-size: 1.1rem; margin-bottom: 1.5rem;'>What best describes your AI implementation stage?</p>", unsafe_allow_html=True)
                 
-                stage_options = [
-                    "Exploring / learning about AI",
-                    "Planning first pilot project",
-                    "Running 1-2 pilot projects",
-                    "Scaling successful pilots",
-                    "AI embedded in operations"
-                ]
+                stage_options = AI_STAGE_OPTIONS
                 
                 selected_stage = st.selectbox(
                     "Select your AI implementation stage:",
@@ -1980,37 +2102,27 @@ def main():
 
             st.markdown("### 📊 Current Progress")
 
-            # Flatten all questions dynamically from DIMENSIONS
-            all_questions = [
-                question
-                for dimension in DIMENSIONS
-                for question in dimension["questions"]
-            ]
-
-            completed_questions = sum(
-                1
-                for question in all_questions
-                if question["id"] in st.session_state.answers
-            )
-
-            total_questions = len(all_questions)
+            running_score = st.session_state.running_score
 
             st.write(
-                f"Questions completed: {completed_questions}/{total_questions}"
+                f"Questions completed: {running_score.answered}/{running_score.question_count}"
             )
 
+            if running_score.answered:
+                readiness_band = running_score.readiness_band()
+                st.markdown("### Live Score Preview")
+                st.write(
+                    f"**{readiness_band['label']}** "
+                    f"({running_score.provisional_percentage()}% so far)"
+                )
+                critical_status = running_score.critical_status()
+                if critical_status["severity"] != "info":
+                    st.caption(f"{critical_status['icon']} {critical_status['message']}")
 
-            if st.session_state.answers:
                 st.markdown("### Your Current Answers")
-                for dim_idx, dimension in enumerate(DIMENSIONS):
-                    dim_answers = []
-                    for q in dimension['questions']:
-                        if q['id'] in st.session_state.answers:
-                            dim_answers.append(
-                                st.session_state.answers[q['id']])
-
-                    if dim_answers:
-                        dimension_avg = sum(dim_answers) / len(dim_answers)
+                for dim_idx, dimension in enumerate(get_active_dimensions()):
+                    dimension_avg = running_score.dimension_average(dim_idx)
+                    if dimension_avg is not None:
                         st.write(
                             f"**{dimension['title']}**: {dimension_avg:.1f}/5")
 
@@ -0,0 +1,98 @@
+"""
+Process-wide cache for benchmark reads.
+
+Entries expire after a TTL and are stamped with the cache version current
+when they were loaded. Writers bump the version after committing, so every
+reader in the process refreshes on its next lookup instead of waiting out
+the TTL; the TTL bounds staleness for writes made by other processes.
+Misses are single-flight per key: concurrent sessions wait for the one load
+in progress instead of all querying the database.
+"""
+
+import os
+import threading
+import time
+
+DEFAULT_BENCHMARK_CACHE_TTL = 60.0
+
+
+class BenchmarkCache:
+    """Thread-safe TTL cache with a version stamp and per-key single flight"""
+
+    def __init__(self, ttl=DEFAULT_BENCHMARK_CACHE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def _fresh(self, entry):
+        return (
+            entry is not None
+            and entry[2] == self.version
+            and time.monotonic() - entry[1] < self.ttl
+        )
+
+    def get_or_load(self, key, load):
+        """Return the cached value for key, loading it at most once per miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if self._fresh(entry):
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                # Another thread may have loaded it while we waited
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if self._fresh(entry):
+                        return entry[0]
+                    version = self.version
+
+                value = load()
+
+                with self._lock:
+                    self.loads += 1
+                    # Drop the result if a write committed while it was loading
+                    if version == self.version:
+                        self._entries[key] = (value, time.monotonic(), version)
+                return value
+        finally:
+            # Threads already waiting keep their reference; later misses make a new lock
+            with self._lock:
+                if self._key_locks.get(key) is key_lock:
+                    del self._key_locks[key]
+
+    def invalidate(self):
+        """Bump the version so every entry is reloaded on its next lookup"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "version": self.version,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+BENCHMARK_CACHE = BenchmarkCache(
+    float(os.environ.get("BENCHMARK_CACHE_TTL", DEFAULT_BENCHMARK_CACHE_TTL))
+)
+
+
+def invalidate_benchmark_cache():
+    BENCHMARK_CACHE.invalidate()
@@ -16,6 +16,7 @@ def generate_html_report(
     company_logo_b64=None,
     primary_color="#F97316",
     assessment_date=None,
+    benchmark_snapshot_id=None,
 ):
 
     if not assessment_date:
@@ -174,6 +175,8 @@ def generate_html_report(
         f"<strong>{company_name}</strong><br>Date: {assessment_date}"
         if company_name else f"Date: {assessment_date}"
     )
+    if benchmark_snapshot_id is not None:
+        company_section += f"<br>Benchmark snapshot: #{benchmark_snapshot_id}"
 
     logo_html = ""
     if company_logo_b64:
@@ -0,0 +1,164 @@
+"""
+Batch narrative generation for bulk report export.
+
+Builds executive summaries and dimension directive lists for N assessments
+from a compute_scores_batch result. All text is assembled from fragments
+prepared once per scoring plan, and the weakest two dimensions come from
+argpartition, so no per-assessment sorting happens in Python. The output
+matches generate_executive_summary and generate_dimension_recommendations.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from data.dimensions import DIMENSIONS
+from utils.recommendations import (MODERATE_THRESHOLD, STRONG_THRESHOLD,
+                                   critical_directives, moderate_directives,
+                                   strong_directives)
+from utils.scoring import (GOVERNANCE_EMERGING, GOVERNANCE_INSUFFICIENT,
+                           GOVERNANCE_STABLE, GOVERNANCE_SUMMARY_CUTOFFS,
+                           SUMMARY_CLOSING)
+from utils.scoring_plan import SCORING_PLAN
+
+GOVERNANCE_SENTENCES = (GOVERNANCE_INSUFFICIENT, GOVERNANCE_EMERGING, GOVERNANCE_STABLE)
+
+# Directive tiers, indexed by tier code
+TIER_CRITICAL = 0
+TIER_MODERATE = 1
+TIER_STRONG = 2
+
+
+class NarrativeTemplates:
+    """Text fragments prepared once for one ScoringPlan"""
+
+    __slots__ = ("plan", "summary_openings", "weakness_fragments", "directives")
+
+    def __init__(self, plan):
+        self.plan = plan
+        dimensions = {dimension["id"]: dimension for dimension in DIMENSIONS}
+
+        # Opening sentence per band, plus the restricted band last
+        bands = list(plan.bands) + [plan.restricted_band]
+        self.summary_openings = tuple(
+            f"This assessment assigns an AI Readiness Score of {band['label']}. "
+            "The most material improvement areas are "
+            for band in bands
+        )
+
+        # "<title> (<score>/15)" for every whole-number score of every dimension
+        self.weakness_fragments = tuple(
+            tuple(f"{title} ({float(score)}/15)" for score in range(plan.dimension_max + 1))
+            for title in plan.dimension_titles
+        )
+
+        # Directive list per dimension and tier
+        self.directives = tuple(
+            (
+                tuple(critical_directives(dimensions.get(dim_id, {"id": dim_id}))),
+                tuple(moderate_directives(dimensions.get(dim_id, {"id": dim_id}))),
+                tuple(strong_directives(dimensions.get(dim_id, {"id": dim_id}))),
+            )
+            for dim_id in plan.dimension_ids
+        )
+
+    def weakness_fragment(self, dim_pos, score):
+        if float(score).is_integer() and 0 <= score <= self.plan.dimension_max:
+            return self.weakness_fragments[dim_pos][int(score)]
+        return f"{self.plan.dimension_titles[dim_pos]} ({float(score)}/15)"
+
+
+@lru_cache(maxsize=None)
+def get_narrative_templates(plan=SCORING_PLAN):
+    return NarrativeTemplates(plan)
+
+
+# ------------------------------------------
+# VECTORIZED SELECTION
+# ------------------------------------------
+
+def weakest_two_dimensions(raw_dimension_scores):
+    """
+    Positions of the two lowest-scoring dimensions per row, lowest first.
+    Ties keep dimension order, like the stable sort in
+    generate_executive_summary.
+    """
+    dimension_count = raw_dimension_scores.shape[1]
+    # Scores have one decimal, so this integer key is exact and tie-breaks by position
+    keys = np.round(raw_dimension_scores * 10).astype(np.int64) * dimension_count \
+        + np.arange(dimension_count)
+    weakest = np.argpartition(keys, 1, axis=1)[:, :2]
+    swap = np.take_along_axis(keys, weakest, axis=1)
+    swap = swap[:, 0] > swap[:, 1]
+    weakest[swap] = weakest[swap][:, ::-1]
+    return weakest
+
+
+def directive_tiers(raw_dimension_scores):
+    """Tier code (critical / moderate / strong) per row and dimension"""
+    return (
+        (raw_dimension_scores >= MODERATE_THRESHOLD).astype(np.int8)
+        + (raw_dimension_scores >= STRONG_THRESHOLD)
+    )
+
+
+# ------------------------------------------
+# PUBLIC API
+# ------------------------------------------
+
+def generate_narratives_batch(batch, plan=SCORING_PLAN, summaries=True, recommendations=True):
+    """
+    Executive summaries and directive lists for every row of a
+    compute_scores_batch result.
+
+    Args:
+        batch: Result of compute_scores_batch / ScoringPlan.score_batch
+        plan: ScoringPlan the batch was scored with
+        summaries: Build executive summary strings
+        recommendations: Build per-dimension directive lists
+
+    Returns:
+        Dict with "executive_summaries" (list of str) and "recommendations"
+        (list of generate_dimension_recommendations-style lists). Directive
+        lists are shared tuples and must not be modified.
+    """
+    templates = get_narrative_templates(plan)
+    raw = batch["raw_dimension_scores"]
+    result = {}
+
+    if summaries:
+        opening_code = np.where(
+            batch["governance_override"], len(plan.bands), batch["band_code"]
+        )
+        weakest = weakest_two_dimensions(raw)
+        weakest_scores = np.take_along_axis(raw, weakest, axis=1)
+        governance_tier = np.searchsorted(
+            GOVERNANCE_SUMMARY_CUTOFFS, batch["governance_index"], side="right"
+        )
+
+        openings = templates.summary_openings
+        fragment = templates.weakness_fragment
+        result["executive_summaries"] = [
+            openings[opening]
+            + fragment(first, first_score) + ", " + fragment(second, second_score) + ". "
+            + GOVERNANCE_SENTENCES[tier]
+            + SUMMARY_CLOSING
+            for opening, (first, second), (first_score, second_score), tier in zip(
+                opening_code.tolist(), weakest.tolist(), weakest_scores.tolist(),
+                governance_tier.tolist()
+            )
+        ]
+
+    if recommendations:
+        tiers = directive_tiers(raw).tolist()
+        directives = templates.directives
+        titles = plan.dimension_titles
+        result["recommendations"] = [
+            [
+                {"title": titles[dim_pos], "score": score, "recommendations": directives[dim_pos][tier]}
+                for dim_pos, (score, tier) in enumerate(zip(row_scores, row_tiers))
+            ]
+            for row_scores, row_tiers in zip(raw.tolist(), tiers)
+        ]
+
+    return result
@@ -29,6 +29,7 @@ import io
 import os
 import math
 import tempfile
+from collections.abc import Mapping
 from typing import Dict, Any, List, Optional
 
 from reportlab.lib.pagesizes import A4
@@ -268,8 +269,8 @@ def generate_pdf_report(
     Main entrypoint. Returns PDF as bytes.
     """
     # Validate minimal structure
-    if not isinstance(results, dict):
-        raise ValueError("results must be a dict")
+    if not isinstance(results, Mapping):
+        raise ValueError("results must be a mapping")
 
     # Ensure dimension names in expected order
     dims_expected = list(BASELINE_DIMENSION_AVG.keys())
@@ -292,7 +293,7 @@ def generate_pdf_report(
         overall_score = float(sum(dimension_scores.values()))
     
     readiness_band_data = results.get("readiness_band", {})
-    if isinstance(readiness_band_data, dict):
+    if isinstance(readiness_band_data, Mapping):
         readiness_label = readiness_band_data.get("label", "Foundational")
     else:
         readiness_label = "Foundational"
@@ -0,0 +1,296 @@
+"""
+Exact percentile engine built from answer histograms.
+
+Completed assessments are folded into three kinds of histogram series:
+
+    question:<id>    counts of each answer (1-5) per question
+    dimension:<id>   counts of each joint answer combination per dimension
+    total            counts of each total score
+
+Per-dimension score distributions are derived exactly from the joint
+answer counts, and the total distribution comes from its own series, so
+no assumption of independence between dimensions is needed. Cumulative
+tables are cached and only rebuilt when the histograms change, which makes
+a percentile lookup a single table index.
+
+Questionnaire variants keep separate histograms; their stored series names
+carry a "<variant id>/" prefix.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from utils.scoring_plan import DEFAULT_VARIANT_ID, SCORING_PLAN
+
+TOTAL_SERIES = "total"
+
+
+def question_series(question_id):
+    return f"question:{question_id}"
+
+
+def dimension_series(dimension_id):
+    return f"dimension:{dimension_id}"
+
+
+def ordinal(number):
+    """Rounded number with its English ordinal suffix: 1st, 2nd, 3rd, 11th, 22nd"""
+    number = int(round(number))
+    if 10 <= number % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+    return f"{number}{suffix}"
+
+
+class ScoreHistograms:
+    """Mergeable answer histograms for one ScoringPlan"""
+
+    def __init__(self, plan=SCORING_PLAN):
+        self.plan = plan
+        self.series_prefix = "" if plan.variant_id == DEFAULT_VARIANT_ID else f"{plan.variant_id}/"
+        self.counts = {}
+        self.version = 0
+        self._tables = None
+        self._tables_version = -1
+
+        # Joint cell -> dimension score, per dimension size
+        answer_values = np.array(plan.answer_values)
+        self._cell_scores = {}
+        for dimension_slice in plan.dimension_slices:
+            size = dimension_slice.stop - dimension_slice.start
+            if size not in self._cell_scores:
+                grid = np.meshgrid(*([answer_values] * size), indexing="ij")
+                self._cell_scores[size] = sum(grid).ravel()
+
+    # ------------------------------------------
+    # UPDATES
+    # ------------------------------------------
+
+    def buckets(self, answers):
+        """
+        (series, bucket) pairs to increment for one completed assessment,
+        or an empty list when any answer is missing or off the scale.
+        """
+        plan = self.plan
+        low, high = plan.answer_values[0], plan.answer_values[-1]
+        try:
+            values = [int(answers[question_id]) for question_id in plan.question_ids]
+        except (KeyError, TypeError, ValueError):
+            return []
+        if any(value < low or value > high for value in values):
+            return []
+
+        buckets = [
+            (question_series(question_id), value)
+            for question_id, value in zip(plan.question_ids, values)
+        ]
+        base = len(plan.answer_values)
+        for dim_id, dimension_slice in zip(plan.dimension_ids, plan.dimension_slices):
+            cell = 0
+            for value in values[dimension_slice]:
+                cell = cell * base + (value - low)
+            buckets.append((dimension_series(dim_id), cell))
+        buckets.append((TOTAL_SERIES, sum(values)))
+        return buckets
+
+    def stored_series(self, series):
+        """Series name as stored in the database"""
+        return self.series_prefix + series
+
+    def stored_buckets(self, buckets):
+        return [(self.stored_series(series), bucket) for series, bucket in buckets]
+
+    def add(self, answers):
+        return self.add_buckets(self.buckets(answers))
+
+    def add_buckets(self, buckets, count=1):
+        for series, bucket in buckets:
+            key = (series, bucket)
+            self.counts[key] = self.counts.get(key, 0) + count
+        if buckets:
+            self.version += 1
+        return bool(buckets)
+
+    def merge(self, other):
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.version += 1
+
+    @classmethod
+    def from_rows(cls, rows, plan=SCORING_PLAN):
+        """
+        Build from (series, bucket, count) rows as stored in the database,
+        keeping only the rows of the plan's questionnaire variant.
+        """
+        histograms = cls(plan)
+        prefix = histograms.series_prefix
+        for series, bucket, count in rows:
+            if prefix:
+                if not series.startswith(prefix):
+                    continue
+                series = series[len(prefix):]
+            elif "/" in series:
+                continue
+            histograms.counts[(series, bucket)] = count
+        histograms.version += 1
+        return histograms
+
+    # ------------------------------------------
+    # DISTRIBUTIONS
+    # ------------------------------------------
+
+    @property
+    def assessment_count(self):
+        return int(self.distribution(TOTAL_SERIES).sum())
+
+    def series_counts(self, series, size):
+        counts = np.zeros(size, dtype=np.int64)
+        for (key_series, bucket), count in self.counts.items():
+            if key_series == series and 0 <= bucket < size:
+                counts[bucket] += count
+        return counts
+
+    def distribution(self, series):
+        """Counts indexed by score for the total or a dimension series"""
+        plan = self.plan
+        if series == TOTAL_SERIES:
+            return self.series_counts(TOTAL_SERIES, plan.max_possible + 1)
+
+        dim_pos = plan.dimension_ids.index(series.split(":", 1)[1])
+        dimension_slice = plan.dimension_slices[dim_pos]
+        cell_scores = self._cell_scores[dimension_slice.stop - dimension_slice.start]
+        cells = self.series_counts(series, len(cell_scores))
+        return np.bincount(cell_scores, weights=cells, minlength=plan.dimension_max + 1).astype(np.int64)
+
+    def _percentile_tables(self):
+        """
+        series -> (percentile rank table, cumulative fraction table), both
+        indexed by integer score, or None for a series without data
+        """
+        if self._tables_version != self.version:
+            tables = {}
+            series_list = [TOTAL_SERIES] + [dimension_series(dim_id) for dim_id in self.plan.dimension_ids]
+            for series in series_list:
+                counts = self.distribution(series)
+                total = counts.sum()
+                if total:
+                    cumulative = np.cumsum(counts)
+                    below = cumulative - counts
+                    # Mid-rank: everyone below plus half of the ties
+                    tables[series] = ((below + counts / 2) / total * 100, cumulative / total)
+                else:
+                    tables[series] = None
+            self._tables = tables
+            self._tables_version = self.version
+        return self._tables
+
+    def percentile(self, score, series=TOTAL_SERIES):
+        """
+        Percentile rank (0-100) of a score within the total or a
+        dimension series, or None when there is no data yet.
+        """
+        tables = self._percentile_tables().get(series)
+        if tables is None:
+            return None
+        table = tables[0]
+        index = int(round(score))
+        index = min(max(index, 0), len(table) - 1)
+        return float(table[index])
+
+    def quantile(self, q, series=TOTAL_SERIES):
+        """
+        Lowest score that at least a fraction q (0-1) of assessments are at
+        or below in the total or a dimension series, or None when there is
+        no data yet. quantile(0.9) is the threshold of the top 10%.
+        """
+        tables = self._percentile_tables().get(series)
+        if tables is None:
+            return None
+        cumulative = tables[1]
+        # Tolerance keeps exact fractions such as 0.5 from rounding up a score
+        target = max(min(max(q, 0.0), 1.0) - 1e-9, 1e-12)
+        index = int(np.searchsorted(cumulative, target, side="left"))
+        return float(min(index, len(cumulative) - 1))
+
+    def quantiles(self, qs, series=TOTAL_SERIES):
+        return {q: self.quantile(q, series) for q in qs}
+
+    def dimension_percentiles(self, raw_dimension_scores):
+        return {
+            dim_id: self.percentile(score, dimension_series(dim_id))
+            for dim_id, score in zip(self.plan.dimension_ids, raw_dimension_scores)
+        }
+
+
+# ------------------------------------------
+# PROCESS-WIDE ENGINE
+# ------------------------------------------
+
+# variant id -> (histograms, monotonic load time, monotonic time of the
+# last failed load or None)
+_engines = {}
+_engine_lock = threading.Lock()
+# variant id -> lock held while that variant is fetched from the database
+_load_locks = {}
+
+
+def _cached_engine(variant_id, max_age):
+    """(histograms, whether they can be served without a reload); call under _engine_lock"""
+    engine, loaded_at, failed_at = _engines.get(variant_id, (None, 0.0, None))
+    now = time.monotonic()
+    if engine is not None and now - loaded_at < max_age:
+        return engine, True
+    # Back off after a failed load until the next reload interval
+    if failed_at is not None and now - failed_at < max_age:
+        return engine, True
+    return engine, False
+
+
+def get_percentile_engine(max_age=300, variant_id=None):
+    """
+    Histograms of a questionnaire variant (the base questionnaire by
+    default) loaded from the database, reloaded at most every max_age
+    seconds. Returns None when the database is unavailable.
+
+    The fetch runs outside the global lock: while one session reloads a
+    variant, others serve its previous histograms, and a failed load is
+    not retried for max_age seconds.
+    """
+    variant_id = variant_id or DEFAULT_VARIANT_ID
+
+    with _engine_lock:
+        engine, usable = _cached_engine(variant_id, max_age)
+        if usable:
+            return engine
+        load_lock = _load_locks.setdefault(variant_id, threading.Lock())
+
+    # Only wait for a reload in progress when there is nothing to serve yet
+    if not load_lock.acquire(blocking=engine is None):
+        return engine
+    try:
+        with _engine_lock:
+            engine, usable = _cached_engine(variant_id, max_age)
+            if usable:
+                return engine
+
+        try:
+            from db.operations import get_score_histogram_rows
+            from utils.variants import get_variant
+
+            engine = ScoreHistograms.from_rows(
+                get_score_histogram_rows(), get_variant(variant_id).plan
+            )
+            with _engine_lock:
+                _engines[variant_id] = (engine, time.monotonic(), None)
+        except Exception as e:
+            print(f"Percentile histogram fetch error: {e}")
+            with _engine_lock:
+                previous, loaded_at, _ = _engines.get(variant_id, (None, 0.0, None))
+                _engines[variant_id] = (previous, loaded_at, time.monotonic())
+
+        return engine
+    finally:
+        load_lock.release()
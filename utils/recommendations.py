@@ -5,6 +5,10 @@ Generates executive-level action directives by dimension.
 
 from data.dimensions import DIMENSIONS
 
+# Dimension score (out of 15) needed for each directive tier
+STRONG_THRESHOLD = 12
+MODERATE_THRESHOLD = 9
+
 
 def generate_dimension_recommendations(scores_data):
 
@@ -18,10 +22,10 @@ def generate_dimension_recommendations(scores_data):
 
         title = dimension["title"]
 
-        if score >= 12:
+        if score >= STRONG_THRESHOLD:
             recs = strong_directives(dimension)
 
-        elif score >= 9:
+        elif score >= MODERATE_THRESHOLD:
             recs = moderate_directives(dimension)
 
         else:
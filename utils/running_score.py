@@ -0,0 +1,121 @@
+"""
+Incremental running score for an assessment in progress.
+
+Keeps per-dimension totals and answered counts up to date as answers
+change, so the sidebar and the live score preview never rescan DIMENSIONS.
+"""
+
+from utils.scoring_plan import SCORING_PLAN
+
+
+class RunningScore:
+    """O(1)-per-answer accumulator over a ScoringPlan"""
+
+    __slots__ = ("plan", "answers", "dimension_totals", "answered_counts", "total",
+                 "_answer_max", "_dimension_maxima")
+
+    def __init__(self, plan=SCORING_PLAN):
+        self.plan = plan
+        self.answers = {}
+        self.dimension_totals = [0.0] * len(plan.dimension_ids)
+        self.answered_counts = [0] * len(plan.dimension_ids)
+        self.total = 0.0
+        # Per question and per dimension (question count x scale maximum), so
+        # variants with uneven dimensions project correctly
+        self._answer_max = plan.answer_values[-1]
+        self._dimension_maxima = tuple(
+            float((dimension_slice.stop - dimension_slice.start) * self._answer_max)
+            for dimension_slice in plan.dimension_slices
+        )
+
+    @classmethod
+    def from_answers(cls, answers, plan=SCORING_PLAN):
+        running = cls(plan)
+        for question_id, value in answers.items():
+            running.set(question_id, value)
+        return running
+
+    # ------------------------------------------
+    # UPDATES
+    # ------------------------------------------
+
+    def set(self, question_id, value):
+        """Record (or change) one answer; unknown question ids are ignored"""
+        position = self.plan.question_index.get(question_id)
+        if position is None:
+            return
+
+        value = float(value)
+        previous = self.answers.get(question_id)
+        if previous == value:
+            return
+
+        dim_pos = position[0]
+        if previous is None:
+            self.answered_counts[dim_pos] += 1
+            previous = 0.0
+
+        self.answers[question_id] = value
+        self.dimension_totals[dim_pos] += value - previous
+        self.total += value - previous
+
+    def reset(self):
+        self.__init__(self.plan)
+
+    # ------------------------------------------
+    # READ-OUTS
+    # ------------------------------------------
+
+    @property
+    def answered(self):
+        return len(self.answers)
+
+    @property
+    def question_count(self):
+        return len(self.plan.question_ids)
+
+    def dimension_average(self, dim_pos):
+        """Average answer (1-5) for a dimension, or None if nothing is answered"""
+        count = self.answered_counts[dim_pos]
+        return self.dimension_totals[dim_pos] / count if count else None
+
+    def projected_dimension_scores(self):
+        """
+        Dimension scores with unanswered questions projected at the
+        dimension's current average. Fully answered dimensions are exact;
+        untouched dimensions are assumed to be at their maximum.
+        """
+        scores = []
+        for dim_pos, dimension_slice in enumerate(self.plan.dimension_slices):
+            count = self.answered_counts[dim_pos]
+            questions = dimension_slice.stop - dimension_slice.start
+            if count == questions:
+                scores.append(round(self.dimension_totals[dim_pos], 1))
+            elif count:
+                scores.append(round(self.dimension_totals[dim_pos] / count * questions, 1))
+            else:
+                scores.append(self._dimension_maxima[dim_pos])
+        return scores
+
+    def provisional_percentage(self):
+        """Percentage of the maximum over the questions answered so far"""
+        if not self.answers:
+            return 0
+        return round((self.total / (self.answered * self._answer_max)) * 100)
+
+    def critical_status(self):
+        return self.plan.critical_status(self.projected_dimension_scores())
+
+    def readiness_band(self):
+        """Provisional band, including the governance override"""
+        return self.plan.readiness_band_for(
+            self.provisional_percentage(), self.critical_status()
+        )
+
+    def critical_flags(self):
+        """Per critical dimension: True when it is currently below threshold"""
+        scores = self.projected_dimension_scores()
+        return {
+            self.plan.dimension_ids[position]: scores[position] < self.plan.critical_threshold
+            for position in self.plan.critical_positions
+        }
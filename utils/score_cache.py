@@ -0,0 +1,89 @@
+"""
+Bounded LRU memoization for compute_scores.
+
+Results are keyed on the canonical answer vector plus the scoring-rules
+version and stored frozen, so a cached result can be shared safely between
+Streamlit sessions, reports and emails.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+DEFAULT_SCORE_CACHE_SIZE = 4096
+
+
+def freeze_scores(scores):
+    """Read-only copy of a compute_scores result (lists become tuples)"""
+    return MappingProxyType({
+        **scores,
+        "raw_dimension_scores": tuple(scores["raw_dimension_scores"]),
+        "dimension_scores": tuple(
+            MappingProxyType(dict(dim_score)) for dim_score in scores["dimension_scores"]
+        ),
+    })
+
+
+def thaw_scores(scores):
+    """Plain, mutable and JSON-serializable copy of a compute_scores result"""
+    return {
+        **scores,
+        "raw_dimension_scores": list(scores["raw_dimension_scores"]),
+        "dimension_scores": [dict(dim_score) for dim_score in scores["dimension_scores"]],
+        "readiness_band": dict(scores["readiness_band"]),
+        "critical_status": dict(scores["critical_status"]),
+    }
+
+
+class ScoreCache:
+    """Thread-safe LRU cache with hit, miss and eviction counters"""
+
+    def __init__(self, maxsize=DEFAULT_SCORE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+SCORE_CACHE = ScoreCache(
+    int(os.environ.get("SCORE_CACHE_SIZE", DEFAULT_SCORE_CACHE_SIZE))
+)
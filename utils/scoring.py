@@ -1,47 +1,42 @@
 from data.dimensions import DIMENSIONS
+from utils.score_cache import SCORE_CACHE, freeze_scores
+from utils.scoring_plan import SCORING_PLAN
+from utils.variants import get_stored_variant_plan, get_variant_scoring_plan
 
 
 # ------------------------------------------
 # CORE SCORING (NO WEIGHTING)
 # ------------------------------------------
 
-def compute_scores(answers):
-
-    raw_dimension_scores = []
-
-    for dimension in DIMENSIONS:
-        dim_total = sum(
-            float(answers.get(question["id"], 0))
-            for question in dimension["questions"]
-        )
-        raw_dimension_scores.append(round(dim_total, 1))
-
-    total_score = sum(raw_dimension_scores)
-    max_possible = len(DIMENSIONS) * 15
+def compute_scores(answers, rules_version=None, variant_id=None):
+    """
+    Score an answers dict with the current rules, or with rules_version
+    when re-rendering a stored assessment, against the base questionnaire
+    or a questionnaire variant. Results are memoized on the canonical
+    answer vector, variant and rules version, and are read-only; use
+    thaw_scores for a mutable copy.
+    """
+    plan = get_variant_scoring_plan(variant_id, rules_version)
+    values = plan.answer_vector(answers)
+    return SCORE_CACHE.get_or_compute(
+        (plan.variant_id, plan.version, values),
+        lambda: freeze_scores(plan.score_vector(values))
+    )
 
-    percentage = round((total_score / max_possible) * 100) if max_possible else 0
 
-    readiness_band = get_readiness_band(percentage)
-    critical_status = get_critical_dimension_status(raw_dimension_scores)
-    governance_index = calculate_governance_index(raw_dimension_scores)
+def compute_stored_scores(assessment):
+    """
+    Scores for a stored Assessment under the variant and rules that produced
+    it. Raises KeyError when those rules are no longer available (see
+    get_stored_variant_plan).
+    """
+    plan = get_stored_variant_plan(assessment.variant_id, assessment.scoring_rules_version)
+    return compute_scores(assessment.answers or {}, plan.version, plan.variant_id)
 
-    # Governance override
-    if critical_status["severity"] in ["critical", "warning"]:
-        if readiness_band["label"] == "🟢 AI-Ready":
-            readiness_band = {
-                "label": "🔵 Conditional Readiness",
-                "color": "#3B82F6",
-                "description": "AI scaling restricted due to critical threshold breach."
-            }
 
-    return {
-        "raw_dimension_scores": raw_dimension_scores,
-        "total": total_score,
-        "percentage": percentage,
-        "readiness_band": readiness_band,
-        "critical_status": critical_status,
-        "governance_index": governance_index
-    }
+def get_score_cache_stats():
+    """Hit, miss and eviction counters for the compute_scores cache"""
+    return SCORE_CACHE.stats()
 
 
 # ------------------------------------------
@@ -49,34 +44,7 @@ def compute_scores(answers):
 # ------------------------------------------
 
 def get_readiness_band(percentage):
-
-    if percentage >= 75:
-        return {
-            "label": "🟢 AI-Ready",
-            "color": "#10B981",
-            "description": "Strong governance and operational foundation."
-        }
-
-    elif percentage >= 60:
-        return {
-            "label": "🔵 Conditional Readiness",
-            "color": "#3B82F6",
-            "description": "AI may proceed cautiously with remediation."
-        }
-
-    elif percentage >= 45:
-        return {
-            "label": "🟡 Foundational Exposure",
-            "color": "#F59E0B",
-            "description": "Significant structural gaps present."
-        }
-
-    else:
-        return {
-            "label": "🔴 High Risk – Not Ready",
-            "color": "#DC2626",
-            "description": "Core governance controls insufficient."
-        }
+    return SCORING_PLAN.readiness_band(percentage)
 
 
 # ------------------------------------------
@@ -84,8 +52,7 @@ def get_readiness_band(percentage):
 # ------------------------------------------
 
 def calculate_governance_index(raw_scores):
-    governance_score = raw_scores[0]  # Governance is first dimension
-    return round((governance_score / 15) * 100)
+    return SCORING_PLAN.governance_index(raw_scores)
 
 
 # ------------------------------------------
@@ -93,43 +60,31 @@ def calculate_governance_index(raw_scores):
 # ------------------------------------------
 
 def get_critical_dimension_status(raw_scores):
+    return SCORING_PLAN.critical_status(raw_scores)
 
-    governance = raw_scores[0]
-    leadership = raw_scores[1]
-    data = raw_scores[2]
-
-    failed = []
-
-    if governance < 9:
-        failed.append(f"Governance ({governance}/15)")
-    if leadership < 9:
-        failed.append(f"Executive Leadership ({leadership}/15)")
-    if data < 9:
-        failed.append(f"Data Foundations ({data}/15)")
-
-    if len(failed) >= 2:
-        return {
-            "severity": "critical",
-            "icon": "🛑",
-            "title": "Critical Threshold Breach",
-            "message": ", ".join(failed) + " are below minimum threshold (9.0)."
-        }
-
-    elif len(failed) == 1:
-        return {
-            "severity": "warning",
-            "icon": "⚠️",
-            "title": "Critical Threshold Warning",
-            "message": failed[0] + " is below minimum threshold (9.0)."
-        }
+# ------------------------------------------
+# EXECUTIVE SUMMARY
+# ------------------------------------------
+
+GOVERNANCE_INSUFFICIENT = (
+    "Governance controls are insufficient to support scaled AI deployment. "
+    "Adopt a Governance First mantra before expansion."
+)
+GOVERNANCE_EMERGING = (
+    "Governance maturity is emerging but requires reinforcement before scaling."
+)
+GOVERNANCE_STABLE = (
+    "Governance maturity provides a stable foundation for disciplined AI execution."
+)
+
+# Governance index needed for the emerging and stable sentences
+GOVERNANCE_SUMMARY_CUTOFFS = (60, 75)
+
+SUMMARY_CLOSING = (
+    " AI amplifies existing strengths and weaknesses. "
+    "Scaling without structural control increases risk, not value."
+)
 
-    else:
-        return {
-            "severity": "info",
-            "icon": "✓",
-            "title": "All Critical Thresholds Met",
-            "message": "Governance, Leadership, and Data meet minimum threshold."
-        }
 
 def generate_executive_summary(scores_data):
     raw_scores = scores_data["raw_dimension_scores"]
@@ -150,23 +105,59 @@ def generate_executive_summary(scores_data):
         f"The most material improvement areas are {weakest_text}. "
     )
 
-    if governance_index < 60:
-        summary += (
-            "Governance controls are insufficient to support scaled AI deployment. "
-            "Adopt a Governance First mantra before expansion."
-        )
-    elif governance_index < 75:
-        summary += (
-            "Governance maturity is emerging but requires reinforcement before scaling."
-        )
+    if governance_index < GOVERNANCE_SUMMARY_CUTOFFS[0]:
+        summary += GOVERNANCE_INSUFFICIENT
+    elif governance_index < GOVERNANCE_SUMMARY_CUTOFFS[1]:
+        summary += GOVERNANCE_EMERGING
     else:
-        summary += (
-            "Governance maturity provides a stable foundation for disciplined AI execution."
-        )
+        summary += GOVERNANCE_STABLE
 
-    summary += (
-        " AI amplifies existing strengths and weaknesses. "
-        "Scaling without structural control increases risk, not value."
-    )
+    summary += SUMMARY_CLOSING
 
     return summary
+
+
+# ------------------------------------------
+# BATCH SCORING (VECTORIZED)
+# ------------------------------------------
+
+# Column order of the answer matrix accepted by compute_scores_batch
+QUESTION_IDS = SCORING_PLAN.question_ids
+
+# Band codes, ordered from weakest to strongest
+BAND_HIGH_RISK = 0
+BAND_FOUNDATIONAL = 1
+BAND_CONDITIONAL = 2
+BAND_AI_READY = 3
+
+
+def answers_to_matrix(answers_rows):
+    """
+    Stack answer dicts into an N x len(QUESTION_IDS) float matrix.
+    Missing answers are scored as 0, exactly like compute_scores.
+    """
+    return SCORING_PLAN.answers_to_matrix(answers_rows)
+
+
+def compute_scores_batch(answers, rules_version=None, variant_id=None):
+    """
+    Score many assessments in one vectorized pass.
+
+    Args:
+        answers: N x 18 answer matrix (columns ordered like QUESTION_IDS,
+                 or like the variant's question ids) or an iterable of
+                 answer dicts
+        rules_version: Scoring rules version (current by default)
+        variant_id: Questionnaire variant (base questionnaire by default)
+
+    Returns:
+        Dict of NumPy arrays with one entry per row. band_code already
+        includes the governance override; governance_override marks the
+        rows it was applied to.
+    """
+    return get_variant_scoring_plan(variant_id, rules_version).score_batch(answers)
+
+
+def batch_row_to_scores(batch, row, rules_version=None, variant_id=None):
+    """Rebuild the compute_scores result for one row of a batch result."""
+    return freeze_scores(get_variant_scoring_plan(variant_id, rules_version).batch_row(batch, row))
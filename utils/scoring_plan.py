@@ -0,0 +1,406 @@
+"""
+Compiled scoring plan for Governance-First AI Readiness Framework.
+
+The plan is built once from DIMENSIONS and the scoring rules. It holds the
+question index, per-dimension slices, threshold arrays and the interned,
+read-only band and critical-status objects, so scoring a submission only
+does arithmetic and table lookups.
+"""
+
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from data.dimensions import DIMENSIONS
+
+
+# ------------------------------------------
+# SCORING RULES
+# ------------------------------------------
+
+SCORING_RULES = {
+    "version": 1,
+    "answer_scale": (1, 5),
+    "dimension_max": 15,
+    # (minimum percentage, label, color, description), weakest band first
+    "bands": (
+        (0, "🔴 High Risk – Not Ready", "#DC2626",
+         "Core governance controls insufficient."),
+        (45, "🟡 Foundational Exposure", "#F59E0B",
+         "Significant structural gaps present."),
+        (60, "🔵 Conditional Readiness", "#3B82F6",
+         "AI may proceed cautiously with remediation."),
+        (75, "🟢 AI-Ready", "#10B981",
+         "Strong governance and operational foundation."),
+    ),
+    # Band used instead of the top band when a critical threshold is missed
+    "restricted_band": (
+        "🔵 Conditional Readiness", "#3B82F6",
+        "AI scaling restricted due to critical threshold breach."
+    ),
+    "critical_threshold": 9,
+    # (dimension id, name used in critical-status messages)
+    "critical_dimensions": (
+        ("governance", "Governance"),
+        ("leadership", "Executive Leadership"),
+        ("data", "Data Foundations"),
+    ),
+    "critical_ok_message": "Governance, Leadership, and Data meet minimum threshold.",
+    "governance_dimension": "governance",
+}
+
+# Questionnaire variant of the base questionnaire in data/questionnaire.json
+DEFAULT_VARIANT_ID = "default"
+
+
+class ScoringPlan:
+    """Scoring rules compiled against one questionnaire"""
+
+    __slots__ = (
+        "version",
+        "variant_id",
+        "dimension_ids",
+        "dimension_titles",
+        "question_ids",
+        "question_index",
+        "dimension_slices",
+        "dimension_starts",
+        "answer_values",
+        "dimension_max",
+        "max_possible",
+        "band_cutoffs",
+        "bands",
+        "restricted_band",
+        "top_band_code",
+        "restricted_band_code",
+        "band_code_by_label",
+        "critical_indices",
+        "critical_positions",
+        "critical_threshold",
+        "governance_position",
+        "_band_by_percentage",
+        "_critical_fragments",
+        "_critical_status",
+        "_critical_ok",
+        "_zeros",
+    )
+
+    def __init__(self, dimensions, rules, variant_id=DEFAULT_VARIANT_ID):
+        self.version = rules["version"]
+        self.variant_id = variant_id
+        self.dimension_ids = tuple(dimension["id"] for dimension in dimensions)
+        self.dimension_titles = tuple(dimension["title"] for dimension in dimensions)
+
+        # question id -> (dimension position, slot within the dimension)
+        question_ids = []
+        question_index = {}
+        dimension_slices = []
+        for dim_pos, dimension in enumerate(dimensions):
+            start = len(question_ids)
+            for slot, question in enumerate(dimension["questions"]):
+                question_index[question["id"]] = (dim_pos, slot)
+                question_ids.append(question["id"])
+            dimension_slices.append(slice(start, len(question_ids)))
+
+        self.question_ids = tuple(question_ids)
+        self.question_index = MappingProxyType(question_index)
+        self.dimension_slices = tuple(dimension_slices)
+        self.dimension_starts = np.array([s.start for s in dimension_slices], dtype=np.intp)
+        self._zeros = (0,) * len(question_ids)
+
+        low, high = rules["answer_scale"]
+        self.answer_values = tuple(range(low, high + 1))
+        self.dimension_max = rules["dimension_max"]
+        self.max_possible = len(dimensions) * self.dimension_max
+
+        # Readiness bands, indexed by band code
+        self.band_cutoffs = np.array([band[0] for band in rules["bands"][1:]])
+        self.bands = tuple(
+            MappingProxyType({"label": label, "color": color, "description": description})
+            for _, label, color, description in rules["bands"]
+        )
+        label, color, description = rules["restricted_band"]
+        self.restricted_band = MappingProxyType(
+            {"label": label, "color": color, "description": description}
+        )
+        self.top_band_code = len(self.bands) - 1
+        self.restricted_band_code = next(
+            code for code, band in enumerate(self.bands) if band["label"] == label
+        )
+        self.band_code_by_label = MappingProxyType(
+            {band["label"]: code for code, band in enumerate(self.bands)}
+        )
+        self._band_by_percentage = tuple(
+            self.bands[self.band_code(percentage)] for percentage in range(101)
+        )
+
+        # Critical dimension checks
+        threshold = rules["critical_threshold"]
+        self.critical_threshold = threshold
+        self.critical_indices = np.array(
+            [self.dimension_ids.index(dim_id) for dim_id, _ in rules["critical_dimensions"]],
+            dtype=np.intp,
+        )
+        self.critical_positions = tuple(int(position) for position in self.critical_indices)
+        self._critical_fragments = tuple(
+            (name, {float(score): f"{name} ({float(score)}/{self.dimension_max})"
+                    for score in range(self.dimension_max + 1)})
+            for _, name in rules["critical_dimensions"]
+        )
+        self._critical_ok = MappingProxyType({
+            "severity": "info",
+            "icon": "✓",
+            "title": "All Critical Thresholds Met",
+            "message": rules["critical_ok_message"],
+        })
+
+        @lru_cache(maxsize=4096)
+        def critical_status(failed):
+            if len(failed) >= 2:
+                return MappingProxyType({
+                    "severity": "critical",
+                    "icon": "🛑",
+                    "title": "Critical Threshold Breach",
+                    "message": ", ".join(failed) + f" are below minimum threshold ({float(threshold)}).",
+                })
+            return MappingProxyType({
+                "severity": "warning",
+                "icon": "⚠️",
+                "title": "Critical Threshold Warning",
+                "message": failed[0] + f" is below minimum threshold ({float(threshold)}).",
+            })
+
+        self._critical_status = critical_status
+        self.governance_position = self.dimension_ids.index(rules["governance_dimension"])
+
+    # ------------------------------------------
+    # TABLE LOOKUPS
+    # ------------------------------------------
+
+    def band_code(self, percentage):
+        """Band code (index into bands) for a percentage, before any override"""
+        return int(np.searchsorted(self.band_cutoffs, percentage, side="right"))
+
+    def readiness_band(self, percentage):
+        # The table covers whole percentages only; anything else is searched
+        if type(percentage) is int and 0 <= percentage <= 100:
+            return self._band_by_percentage[percentage]
+        return self.bands[self.band_code(percentage)]
+
+    def readiness_band_for(self, percentage, critical_status):
+        """Readiness band with the governance override applied"""
+        readiness_band = self.readiness_band(percentage)
+        if critical_status["severity"] != "info" and readiness_band is self.bands[self.top_band_code]:
+            return self.restricted_band
+        return readiness_band
+
+    def governance_index(self, raw_scores):
+        return round((raw_scores[self.governance_position] / self.dimension_max) * 100)
+
+    def critical_status(self, raw_scores):
+        failed = []
+        for position, (name, fragments) in zip(self.critical_positions, self._critical_fragments):
+            score = raw_scores[position]
+            if score < self.critical_threshold:
+                fragment = fragments.get(score) if type(score) is float else None
+                failed.append(fragment or f"{name} ({score}/{self.dimension_max})")
+
+        if not failed:
+            return self._critical_ok
+        return self._critical_status(tuple(failed))
+
+    # ------------------------------------------
+    # SCORING
+    # ------------------------------------------
+
+    def answer_vector(self, answers):
+        """Canonical, hashable answer vector (missing answers score 0)"""
+        return tuple(map(float, map(answers.get, self.question_ids, self._zeros)))
+
+    def score(self, answers):
+        """Score one answers dict (question id -> 1-5)"""
+        return self.score_vector(self.answer_vector(answers))
+
+    def score_vector(self, values):
+        """Score one answer vector ordered like question_ids"""
+        # round(x, 1) is a no-op on whole numbers, which is the common case
+        raw_dimension_scores = [
+            total if total.is_integer() else round(total, 1)
+            for total in map(sum, map(values.__getitem__, self.dimension_slices))
+        ]
+
+        total_score = sum(raw_dimension_scores)
+        percentage = round((total_score / self.max_possible) * 100) if self.max_possible else 0
+
+        critical_status = self.critical_status(raw_dimension_scores)
+        readiness_band = self.readiness_band_for(percentage, critical_status)
+
+        return {
+            "raw_dimension_scores": raw_dimension_scores,
+            "dimension_scores": [
+                {"id": dim_id, "title": title, "score": score}
+                for dim_id, title, score in zip(
+                    self.dimension_ids, self.dimension_titles, raw_dimension_scores
+                )
+            ],
+            "total": total_score,
+            "percentage": percentage,
+            "readiness_band": readiness_band,
+            "critical_status": critical_status,
+            "governance_index": self.governance_index(raw_dimension_scores),
+            "scoring_rules_version": self.version,
+            "variant_id": self.variant_id,
+        }
+
+    def answers_to_matrix(self, answers_rows):
+        """Stack answer dicts into an N x len(question_ids) float matrix"""
+        rows = [
+            list(map(float, map(answers.get, self.question_ids, self._zeros)))
+            for answers in answers_rows
+        ]
+        return np.array(rows, dtype=np.float64).reshape(len(rows), len(self.question_ids))
+
+    def score_batch(self, answers):
+        """
+        Score many assessments in one vectorized pass.
+
+        Args:
+            answers: N x len(question_ids) answer matrix or an iterable of answer dicts
+
+        Returns:
+            Dict of NumPy arrays with one entry per row. band_code already
+            includes the governance override; governance_override marks the
+            rows it was applied to.
+        """
+        if isinstance(answers, np.ndarray):
+            matrix = answers.astype(np.float64, copy=False)
+        else:
+            matrix = self.answers_to_matrix(answers)
+
+        if matrix.ndim != 2 or matrix.shape[1] != len(self.question_ids):
+            raise ValueError(
+                f"Expected an N x {len(self.question_ids)} answer matrix, got shape {matrix.shape}"
+            )
+
+        if matrix.shape[0] == 0:
+            raw_dimension_scores = np.zeros((0, len(self.dimension_ids)))
+        else:
+            raw_dimension_scores = np.round(
+                np.add.reduceat(matrix, self.dimension_starts, axis=1), 1
+            )
+
+        total = raw_dimension_scores.sum(axis=1)
+        percentage = np.round((total / self.max_possible) * 100).astype(np.int64)
+        band_code = np.searchsorted(self.band_cutoffs, percentage, side="right").astype(np.int8)
+
+        critical_failed = raw_dimension_scores[:, self.critical_indices] < self.critical_threshold
+        critical_severity = np.minimum(critical_failed.sum(axis=1), 2).astype(np.int8)
+
+        governance_index = np.round(
+            (raw_dimension_scores[:, self.governance_position] / self.dimension_max) * 100
+        ).astype(np.int64)
+
+        # Governance override
+        governance_override = (critical_severity > 0) & (band_code == self.top_band_code)
+        band_code[governance_override] = self.restricted_band_code
+
+        return {
+            "raw_dimension_scores": raw_dimension_scores,
+            "total": total,
+            "percentage": percentage,
+            "band_code": band_code,
+            "governance_override": governance_override,
+            "governance_index": governance_index,
+            "critical_severity": critical_severity,
+            "critical_failed": critical_failed,
+        }
+
+    def batch_row(self, batch, row):
+        """Rebuild the score() result for one row of a score_batch() result"""
+        raw_dimension_scores = [float(score) for score in batch["raw_dimension_scores"][row]]
+
+        if batch["governance_override"][row]:
+            readiness_band = self.restricted_band
+        else:
+            readiness_band = self.bands[batch["band_code"][row]]
+
+        return {
+            "raw_dimension_scores": raw_dimension_scores,
+            "dimension_scores": [
+                {"id": dim_id, "title": title, "score": score}
+                for dim_id, title, score in zip(
+                    self.dimension_ids, self.dimension_titles, raw_dimension_scores
+                )
+            ],
+            "total": float(batch["total"][row]),
+            "percentage": int(batch["percentage"][row]),
+            "readiness_band": readiness_band,
+            "critical_status": self.critical_status(raw_dimension_scores),
+            "governance_index": int(batch["governance_index"][row]),
+            "scoring_rules_version": self.version,
+            "variant_id": self.variant_id,
+        }
+
+
+def compile_scoring_plan(dimensions=DIMENSIONS, rules=SCORING_RULES, variant_id=DEFAULT_VARIANT_ID):
+    """Compile a questionnaire and rule set into a ScoringPlan"""
+    return ScoringPlan(dimensions, rules, variant_id)
+
+
+# ------------------------------------------
+# RULE VERSIONS
+# ------------------------------------------
+
+# Every rule set that has ever produced stored results, by version.
+# Never edit a released version; register a new one instead.
+SCORING_RULES_VERSIONS = {
+    SCORING_RULES["version"]: SCORING_RULES,
+}
+
+CURRENT_SCORING_RULES_VERSION = SCORING_RULES["version"]
+
+# Assessments saved before versioning were scored with the first rule set
+LEGACY_SCORING_RULES_VERSION = 1
+
+_compiled_plans = {}
+_compile_lock = threading.Lock()
+
+
+def register_scoring_rules(rules):
+    """Add a rule version to the registry (versions are immutable once added)"""
+    version = rules["version"]
+    if version in SCORING_RULES_VERSIONS and SCORING_RULES_VERSIONS[version] is not rules:
+        raise ValueError(f"Scoring rules version {version} is already registered")
+    SCORING_RULES_VERSIONS[version] = rules
+
+
+def get_scoring_plan(version=None):
+    """
+    Compiled plan for a rule version (None = current version). Each
+    version is compiled on first use and then served from memory.
+    """
+    if version is None:
+        version = CURRENT_SCORING_RULES_VERSION
+    plan = _compiled_plans.get(version)
+    if plan is not None:
+        return plan
+
+    with _compile_lock:
+        plan = _compiled_plans.get(version)
+        if plan is None:
+            if version not in SCORING_RULES_VERSIONS:
+                raise KeyError(f"Unknown scoring rules version: {version}")
+            plan = compile_scoring_plan(rules=SCORING_RULES_VERSIONS[version])
+            _compiled_plans[version] = plan
+    return plan
+
+
+def get_stored_scoring_plan(version):
+    """Plan for a version stamped on a stored assessment (NULL = legacy)"""
+    return get_scoring_plan(LEGACY_SCORING_RULES_VERSION if version is None else version)
+
+
+# Built once at import
+SCORING_PLAN = get_scoring_plan()
@@ -0,0 +1,181 @@
+"""
+Answer sensitivity engine ("fastest path to AI-Ready").
+
+Evaluates every single-answer change and every two-answer combination of a
+completed assessment in one vectorized pass over the compiled scoring plan,
+and reports which of them move the organization into a higher readiness
+band or clear a critical threshold.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from utils.scoring_plan import SCORING_PLAN
+from utils.variants import get_variant
+
+
+# ------------------------------------------
+# VECTORIZED EVALUATION
+# ------------------------------------------
+
+@lru_cache(maxsize=256)
+def _evaluate(plan, values):
+    """
+    Score the base answers, all single changes and all two-answer
+    combinations of an answer vector in one batch.
+
+    Returns a tuple of NumPy arrays (read-only by convention):
+        question, new_value: per single change
+        pair_left, pair_right: indexes into the single changes
+        base, singles, pairs: score_batch results split by row group
+    """
+    base = np.array(values, dtype=np.float64)
+    question_count = len(base)
+    answer_values = np.array(plan.answer_values, dtype=np.float64)
+
+    # All 18 x 4 single-answer changes
+    question = np.repeat(np.arange(question_count), len(answer_values))
+    new_value = np.tile(answer_values, question_count)
+    keep = new_value != base[question]
+    question, new_value = question[keep], new_value[keep]
+
+    # All combinations of two single changes on different questions
+    pair_left, pair_right = np.triu_indices(len(question), k=1)
+    distinct = question[pair_left] != question[pair_right]
+    pair_left, pair_right = pair_left[distinct], pair_right[distinct]
+
+    matrix = np.repeat(base[None, :], 1 + len(question) + len(pair_left), axis=0)
+    single_rows = np.arange(1, 1 + len(question))
+    pair_rows = np.arange(1 + len(question), len(matrix))
+    matrix[single_rows, question] = new_value
+    matrix[pair_rows, question[pair_left]] = new_value[pair_left]
+    matrix[pair_rows, question[pair_right]] = new_value[pair_right]
+
+    batch = plan.score_batch(matrix)
+    split = lambda rows: {key: array[rows] for key, array in batch.items()}
+
+    return question, new_value, pair_left, pair_right, split(0), split(single_rows), split(pair_rows)
+
+
+def _improvements(base, outcome):
+    """Masks of rows that reach a higher band and that clear a failed critical dimension"""
+    higher_band = outcome["band_code"] > base["band_code"]
+    cleared = base["critical_failed"] & ~outcome["critical_failed"]
+    return higher_band, cleared
+
+
+# ------------------------------------------
+# PUBLIC API
+# ------------------------------------------
+
+def analyze_sensitivity(answers, plan=SCORING_PLAN, limit=10):
+    """
+    Find the answer changes that lift the readiness band or clear a
+    critical threshold.
+
+    Args:
+        answers: Completed answers dict (question id -> 1-5)
+        plan: ScoringPlan to evaluate against
+        limit: Maximum number of entries per ranked list
+
+    Returns:
+        Dict with the base band, the next band (None when already at the
+        top), ranked single and two-answer changes, and the minimum set of
+        changes that reaches the next band.
+    """
+    questionnaire = get_variant(plan.variant_id).questionnaire
+    values = plan.answer_vector(answers)
+    question, new_value, pair_left, pair_right, base, singles, pairs = _evaluate(plan, values)
+
+    base_band_code = int(base["band_code"])
+    if base["governance_override"]:
+        base_band = plan.restricted_band
+    else:
+        base_band = plan.bands[base_band_code]
+    # score_batch already ranks an overridden result as the restricted band
+    # (restricted_band_code), so the next band is one above that code
+    next_band_code = base_band_code + 1 if base_band_code < plan.top_band_code else None
+
+    single_higher, single_cleared = _improvements(base, singles)
+    pair_higher, pair_cleared = _improvements(base, pairs)
+
+    # A pair is only interesting when neither of its single changes gets as far
+    covered_band = np.maximum(singles["band_code"][pair_left], singles["band_code"][pair_right])
+    covered_cleared = single_cleared[pair_left] | single_cleared[pair_right]
+    pair_new = (pairs["band_code"] > covered_band) | (pair_cleared & ~covered_cleared).any(axis=1)
+
+    single_effort = np.abs(new_value - np.asarray(values)[question])
+    pair_effort = single_effort[pair_left] + single_effort[pair_right]
+
+    single_mask = single_higher | single_cleared.any(axis=1)
+    pair_mask = (pair_higher | pair_cleared.any(axis=1)) & pair_new
+
+    def ranked(mask, outcome, effort):
+        """Rows selected by mask, cheapest first, then best band and percentage"""
+        rows = np.flatnonzero(mask)
+        order = np.lexsort((
+            -outcome["percentage"][rows],
+            -outcome["band_code"][rows],
+            effort[rows],
+        ))
+        return rows[order][:limit]
+
+    def describe(single_indexes, outcome, row, cleared):
+        changes = []
+        for index in single_indexes:
+            question_id = plan.question_ids[question[index]]
+            question_def = questionnaire.question(question_id)
+            to_value = int(new_value[index])
+            changes.append({
+                "question_id": question_id,
+                "question": question_def.text if question_def else question_id,
+                "dimension": plan.dimension_titles[plan.question_index[question_id][0]],
+                "from": int(values[question[index]]),
+                "to": to_value,
+                "to_label": question_def.choice_label(to_value) if question_def else str(to_value),
+            })
+
+        band_code = int(outcome["band_code"][row])
+        return {
+            "changes": changes,
+            "effort": sum(abs(change["to"] - change["from"]) for change in changes),
+            "band_code": band_code,
+            "readiness_band": plan.restricted_band if outcome["governance_override"][row] else plan.bands[band_code],
+            "percentage": int(outcome["percentage"][row]),
+            "clears_critical": [
+                plan.dimension_ids[plan.critical_positions[position]]
+                for position in np.flatnonzero(cleared[row])
+            ],
+        }
+
+    def describe_singles(rows):
+        return [describe((row,), singles, row, single_cleared) for row in rows]
+
+    def describe_pairs(rows):
+        return [
+            describe((pair_left[row], pair_right[row]), pairs, row, pair_cleared)
+            for row in rows
+        ]
+
+    single_changes = describe_singles(ranked(single_mask, singles, single_effort))
+    pair_changes = describe_pairs(ranked(pair_mask, pairs, pair_effort))
+
+    minimum_changes = []
+    if next_band_code is not None:
+        reaches_single = singles["band_code"] >= next_band_code
+        if reaches_single.any():
+            minimum_changes = describe_singles(ranked(reaches_single, singles, single_effort))
+        else:
+            reaches_pair = (pairs["band_code"] >= next_band_code) & pair_new
+            minimum_changes = describe_pairs(ranked(reaches_pair, pairs, pair_effort))
+
+    return {
+        "readiness_band": base_band,
+        "band_code": base_band_code,
+        "percentage": int(base["percentage"]),
+        "next_band": plan.bands[next_band_code] if next_band_code is not None else None,
+        "single_changes": single_changes,
+        "pair_changes": pair_changes,
+        "minimum_changes_to_next_band": minimum_changes,
+    }
@@ -0,0 +1,178 @@
+"""
+Questionnaire variant registry.
+
+Each vertical gets its own question set and thresholds as a declarative
+file in data/variants/<variant id>.json: the questionnaire.json format plus
+an optional "title" and a "scoring_rules" object overriding keys of the
+base SCORING_RULES. Give a variant's rules their own "version" and bump it
+whenever its rules change: results are stamped with it, and stored results
+from an older version are not re-rendered with the new rules. Variants
+keep the six standard dimension ids so stored results and benchmarks stay
+comparable across verticals.
+
+A variant is compiled on first use into its questionnaire (renderer
+metadata) and ScoringPlan, and held in a bounded LRU so a worker serving
+many variants does not keep them all resident. Recompiling an evicted
+variant only re-reads its definition file.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from data.questionnaire import QUESTIONNAIRE, Questionnaire, load_questionnaire
+from utils.scoring_plan import (DEFAULT_VARIANT_ID, SCORING_RULES, ScoringPlan,
+                                compile_scoring_plan, get_scoring_plan,
+                                get_stored_scoring_plan)
+
+VARIANTS_DIR = os.environ.get(
+    'QUESTIONNAIRE_VARIANTS_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'variants')
+)
+
+DEFAULT_VARIANT_CACHE_SIZE = 8
+
+VARIANT_ID_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]{0,49}$')
+
+# Rule keys whose JSON lists are tuples in SCORING_RULES
+_TUPLE_RULES = ('answer_scale', 'bands', 'restricted_band', 'critical_dimensions')
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class QuestionnaireVariant:
+    id: str
+    title: str
+    questionnaire: Questionnaire
+    plan: ScoringPlan
+
+
+# ------------------------------------------
+# COMPILATION
+# ------------------------------------------
+
+def variant_path(variant_id: str) -> str:
+    return os.path.join(VARIANTS_DIR, f'{variant_id}.json')
+
+
+def variant_rules(overrides) -> dict:
+    """Base scoring rules with a variant's overrides applied"""
+    rules = dict(SCORING_RULES)
+    for key, value in (overrides or {}).items():
+        if key not in SCORING_RULES:
+            raise ValueError(f"Unknown scoring rule: {key}")
+        if key in _TUPLE_RULES:
+            value = tuple(tuple(item) if isinstance(item, list) else item for item in value)
+        rules[key] = value
+    return rules
+
+
+def compile_variant(variant_id: str, questionnaire: Questionnaire) -> QuestionnaireVariant:
+    """Compile a loaded variant questionnaire into its scorer"""
+    dimension_ids = tuple(dimension.id for dimension in questionnaire.dimensions)
+    expected = tuple(dimension.id for dimension in QUESTIONNAIRE.dimensions)
+    if dimension_ids != expected:
+        raise ValueError(
+            f"Variant {variant_id} must declare the dimensions {', '.join(expected)} in order"
+        )
+
+    plan = compile_scoring_plan(
+        questionnaire.as_dicts(), variant_rules(questionnaire.scoring_rules), variant_id
+    )
+    return QuestionnaireVariant(
+        id=variant_id,
+        title=questionnaire.title or variant_id,
+        questionnaire=questionnaire,
+        plan=plan,
+    )
+
+
+@lru_cache(maxsize=int(os.environ.get('VARIANT_CACHE_SIZE', DEFAULT_VARIANT_CACHE_SIZE)))
+def _load_variant(variant_id: str) -> QuestionnaireVariant:
+    path = variant_path(variant_id)
+    if not os.path.exists(path):
+        raise KeyError(f"Unknown questionnaire variant: {variant_id}")
+    return compile_variant(variant_id, load_questionnaire(path))
+
+
+# ------------------------------------------
+# PUBLIC API
+# ------------------------------------------
+
+def is_default_variant(variant_id) -> bool:
+    return variant_id is None or variant_id == DEFAULT_VARIANT_ID
+
+
+def get_variant(variant_id=None) -> QuestionnaireVariant:
+    """
+    Compiled variant by id; None or "default" is the base questionnaire
+    with the current scoring rules.
+    """
+    if is_default_variant(variant_id):
+        return DEFAULT_VARIANT
+    if not VARIANT_ID_PATTERN.match(variant_id):
+        raise KeyError(f"Unknown questionnaire variant: {variant_id}")
+    return _load_variant(variant_id)
+
+
+def get_variant_scoring_plan(variant_id=None, rules_version=None) -> ScoringPlan:
+    """
+    Plan for a variant. The default variant supports every registered rules
+    version; other variants only have the rules in their definition file.
+    """
+    if is_default_variant(variant_id):
+        return get_scoring_plan(rules_version)
+    plan = get_variant(variant_id).plan
+    if rules_version is not None and rules_version != plan.version:
+        raise KeyError(f"Unknown scoring rules version {rules_version} for variant {variant_id}")
+    return plan
+
+
+def get_stored_variant_plan(variant_id, rules_version) -> ScoringPlan:
+    """
+    Plan for the variant and version stamped on a stored assessment (NULL =
+    default, legacy). Only a variant's current rules are kept, so a stored
+    variant result whose version no longer matches its definition cannot be
+    reproduced and is refused rather than re-rendered with different rules.
+    
+    Raises:
+        KeyError: unknown variant, or its rules version has changed
+    """
+    if is_default_variant(variant_id):
+        return get_stored_scoring_plan(rules_version)
+    plan = get_variant(variant_id).plan
+    if rules_version is not None and rules_version != plan.version:
+        raise KeyError(
+            f"Variant {variant_id} now has scoring rules version {plan.version}; "
+            f"stored results used version {rules_version}"
+        )
+    return plan
+
+
+def list_variants() -> list:
+    """Ids of all available variants, default first"""
+    variant_ids = []
+    if os.path.isdir(VARIANTS_DIR):
+        variant_ids = sorted(
+            name[:-len('.json')] for name in os.listdir(VARIANTS_DIR)
+            if name.endswith('.json') and VARIANT_ID_PATTERN.match(name[:-len('.json')])
+        )
+    return [DEFAULT_VARIANT_ID] + [v for v in variant_ids if v != DEFAULT_VARIANT_ID]
+
+
+def get_variant_cache_stats() -> dict:
+    info = _load_variant.cache_info()
+    return {
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+        'hits': info.hits,
+        'misses': info.misses,
+    }
+
+
+DEFAULT_VARIANT = QuestionnaireVariant(
+    id=DEFAULT_VARIANT_ID,
+    title=QUESTIONNAIRE.title or 'Governance-First AI Readiness',
+    questionnaire=QUESTIONNAIRE,
+    plan=get_scoring_plan(),
+)